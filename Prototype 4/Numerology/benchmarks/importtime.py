@@ -0,0 +1,114 @@
+# benchmarks/importtime.py — IMPORT-TIME BUDGET CHECK
+"""
+Measures `python -X importtime -c "import <module>"` for the app's entry
+modules and compares it with benchmarks/import_budget.json.
+
+Fails (exit 1) when
+  - a module cannot be imported at all,
+  - a module's median cumulative import time exceeds its budget, or
+  - a module pulls in something it must load lazily (e.g. reportlab at startup).
+
+Run from the app folder:
+    python benchmarks/importtime.py            # check
+    python benchmarks/importtime.py --update   # re-measure and rewrite budgets
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+APP_DIR = os.path.dirname(HERE)
+BUDGET_FILE = os.path.join(HERE, "import_budget.json")
+HEADROOM = 1.5   # --update writes measured median × this
+
+
+def measure(module, runs=5):
+    """Return (median cumulative µs, set of every module imported)."""
+    env = dict(os.environ, QT_QPA_PLATFORM=os.environ.get("QT_QPA_PLATFORM", "offscreen"))
+    totals = []
+    imported = set()
+
+    for _ in range(runs):
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=APP_DIR, env=env, capture_output=True, text=True
+        )
+        if proc.returncode != 0:
+            raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+
+        total = None
+        for line in proc.stderr.splitlines():
+            if not line.startswith("import time:") or "|" not in line:
+                continue
+            parts = line[len("import time:"):].split("|")
+            if not parts[0].strip().isdigit():
+                continue  # header line
+            name = parts[2].strip()
+            imported.add(name)
+            if name == module:
+                total = int(parts[1])
+        totals.append(total)
+
+    return statistics.median(totals), imported
+
+
+def _forbidden_hits(imported, forbidden):
+    hits = set()
+    for mod in imported:
+        for f in forbidden:
+            if mod == f or mod.startswith(f + "."):
+                hits.add(f)
+    return sorted(hits)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--update", action="store_true", help="rewrite budgets from this machine")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    with open(BUDGET_FILE, encoding="utf-8") as fh:
+        budgets = json.load(fh)
+
+    failed = False
+    for module, spec in budgets.items():
+        try:
+            median_us, imported = measure(module, args.runs)
+        except RuntimeError as e:
+            print(f"{module:<8} {'n/a':>8}      FAIL (import error: {e})")
+            failed = True
+            continue
+
+        ms = median_us / 1000
+        hits = _forbidden_hits(imported, spec.get("forbidden", []))
+
+        if args.update:
+            spec["max_ms"] = round(ms * HEADROOM, 1)
+
+        status = "ok"
+        if hits:
+            status = "FAIL (imports " + ", ".join(hits) + ")"
+        elif ms > spec["max_ms"]:
+            status = f"FAIL (budget {spec['max_ms']} ms)"
+        failed |= status != "ok"
+        print(f"{module:<8} {ms:8.1f} ms   {status}")
+
+    if args.update:
+        if failed:
+            print("budgets not updated: fix the failing imports first")
+            return 1
+        with open(BUDGET_FILE, "w", encoding="utf-8") as fh:
+            json.dump(budgets, fh, indent=2)
+            fh.write("\n")
+        print("budgets updated")
+        return 0
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
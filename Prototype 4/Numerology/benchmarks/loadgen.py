@@ -0,0 +1,406 @@
+# benchmarks/loadgen.py — LOAD GENERATOR FOR THE CALCULATION / RENDER / REPORT PATHS
+"""
+Drives calculate, grid (PNG), svg or pdf requests at a chosen concurrency
+and reports what one box sustains: throughput, p50/p95/p99 latency, CPU
+and memory.
+
+Two ways to arrive:
+  closed loop (default)  --concurrency N clients, each sends its next request
+                         as soon as the previous one finishes
+  open loop              --rate R requests/s with Poisson arrivals; latency is
+                         measured from the scheduled arrival, so queueing
+                         behind a saturated box is counted, not hidden
+
+Two ways to run:
+  in-process (default)   calls core directly, on threads or --processes
+  --url URL              sends HTTP requests to a running service.py; pass
+                         --server-pid to sample the server's CPU and memory
+
+Input mix: --unique is the fraction of requests with a never-seen name/DOB;
+the rest are drawn from a --hot set of repeated clients (what caching and
+request coalescing feed on).
+
+Run from the app folder:
+    python benchmarks/loadgen.py calculate --duration 10 --concurrency 8
+    python benchmarks/loadgen.py pdf --rate 5 --unique 0.1 --processes
+    python benchmarks/loadgen.py pdf --url http://127.0.0.1:8765 --server-pid 1234
+"""
+
+import argparse
+import http.client
+import json
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from datetime import date, timedelta
+from urllib.parse import urlsplit
+
+from run import FIRST, LAST, GENDERS, SEED   # also puts the app folder on sys.path
+
+from core.memprof import rss_bytes, max_rss_bytes
+
+TARGETS = ("calculate", "grid", "svg", "pdf")
+GRID_SIZE = 520
+
+
+# ----------------------------------------------------
+# Inputs
+# ----------------------------------------------------
+class InputMix:
+    """Thread-safe stream of (name, dob, gender): `unique` share fresh, the rest from a hot set."""
+
+    def __init__(self, unique: float, hot: int, seed: int = SEED):
+        self.unique = unique
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._serial = 0
+        self.hot = [self._fresh() for _ in range(max(1, hot))]
+
+    def _fresh(self):
+        self._serial += 1
+        rng = self._rng
+        # the serial keeps "unique" names unique even when the random parts repeat
+        name = f"{rng.choice(FIRST)} {rng.choice(LAST)} {self._serial}"
+        return name, date(1940, 1, 1) + timedelta(days=rng.randrange(30000)), rng.choice(GENDERS)
+
+    def next(self):
+        with self._lock:
+            if self._rng.random() < self.unique:
+                return self._fresh()
+            return self._rng.choice(self.hot)
+
+
+# ----------------------------------------------------
+# Callers — each takes one input and raises on failure
+# ----------------------------------------------------
+_caches = {}   # cache dir -> ReportCache, one per process so repeats coalesce
+
+
+def call_inproc(target, rec, profile, cache_dir):
+    """One in-process request; module-level so process pools can pickle it."""
+    name, dob, gender = rec
+    if target == "calculate":
+        from core.numerology_calculations import calculate_all
+        from core.driver_conductor import get_phase_analysis
+
+        results = calculate_all(name, dob, gender)
+        get_phase_analysis(results["Mulank"], results["Bhagyank"])
+        return 200
+
+    from core.numerology_calculations import calculate_all
+    from core.loshu import loshu_digits
+
+    if target in ("grid", "svg"):
+        digits = loshu_digits(dob, calculate_all(name, dob, gender))
+        if target == "grid":
+            from core.reports import render_grid_png
+            render_grid_png(digits, GRID_SIZE)
+        else:
+            from core.loshu import render_loshu_svg
+            render_loshu_svg(digits, GRID_SIZE)
+        return 200
+
+    from core.reports import render_report_pdf, build_payload
+    if cache_dir:
+        cache = _caches.get(cache_dir)
+        if cache is None:
+            from core.report_cache import ReportCache
+            cache = _caches.setdefault(cache_dir, ReportCache(cache_dir))
+        cache.get_or_render(build_payload(name, dob, gender, os.path.join(cache_dir, "grids")), profile=profile)
+    else:
+        render_report_pdf(name, dob, gender, profile)
+    return 200
+
+
+class HttpCaller:
+    """One keep-alive connection per thread to service.py."""
+
+    PATHS = {"calculate": "/calculate", "grid": "/loshu.png", "svg": "/loshu.svg", "pdf": "/report.pdf"}
+
+    def __init__(self, url, target, profile):
+        parts = urlsplit(url)
+        self.host, self.port = parts.hostname, parts.port or 80
+        self.path = self.PATHS[target]
+        self.profile = profile
+        self._local = threading.local()
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = http.client.HTTPConnection(self.host, self.port, timeout=120)
+        return conn
+
+    def __call__(self, rec):
+        name, dob, gender = rec
+        body = {"name": name, "dob": dob.isoformat(), "gender": gender, "size": GRID_SIZE, "profile": self.profile}
+        conn = self._conn()
+        try:
+            conn.request("POST", self.path, json.dumps(body), {"Content-Type": "application/json"})
+            resp = conn.getresponse()
+            resp.read()
+        except (OSError, http.client.HTTPException):
+            conn.close()
+            self._local.conn = None
+            raise
+        if resp.status != 200:
+            raise RuntimeError(f"HTTP {resp.status}")
+        return resp.status
+
+
+# ----------------------------------------------------
+# CPU / memory
+# ----------------------------------------------------
+def _proc_stat(pid):
+    """(ppid, cpu seconds incl. reaped children) from /proc/<pid>/stat, or None."""
+    try:
+        with open(f"/proc/{pid}/stat") as fh:
+            fields = fh.read().rsplit(")", 1)[1].split()
+        ticks = sum(int(f) for f in fields[11:15])   # utime, stime, cutime, cstime
+        return int(fields[1]), ticks / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _proc_rss(pid):
+    try:
+        with open(f"/proc/{pid}/statm") as fh:
+            return int(fh.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return None
+
+
+def _process_tree(pid):
+    """`pid` and all its live descendants (pool workers)."""
+    parents = {}
+    for entry in os.listdir("/proc"):
+        if entry.isdigit():
+            stat = _proc_stat(int(entry))
+            if stat:
+                parents.setdefault(stat[0], []).append(int(entry))
+    tree, todo = [], [pid]
+    while todo:
+        p = todo.pop()
+        tree.append(p)
+        todo.extend(parents.get(p, ()))
+    return tree
+
+
+def tree_cpu_seconds(pid):
+    """CPU used by a process and its descendants; None without /proc."""
+    stats = [_proc_stat(p) for p in _process_tree(pid)] if os.path.isdir("/proc") else []
+    if not stats or stats[0] is None:
+        if pid == os.getpid():
+            times = os.times()
+            return times.user + times.system + times.children_user + times.children_system
+        return None
+    return sum(stat[1] for stat in stats if stat)
+
+
+def tree_rss_bytes(pid):
+    if not os.path.isdir("/proc"):
+        return rss_bytes() if pid == os.getpid() else None
+    return sum(_proc_rss(p) or 0 for p in _process_tree(pid))
+
+
+class ResourceSampler(threading.Thread):
+    """
+    Samples CPU and RSS of this process and, optionally, a server process
+    while the run lasts. Both include live child processes (pool workers),
+    read from /proc: os.times() only counts children once they are reaped.
+    """
+
+    def __init__(self, server_pid=None, interval=0.25):
+        super().__init__(daemon=True)
+        self.server_pid = server_pid
+        self.interval = interval
+        self.peak_rss = 0
+        self.server_peak_rss = 0
+        self._done = threading.Event()
+
+    def run(self):
+        me = os.getpid()
+        while True:
+            self.peak_rss = max(self.peak_rss, tree_rss_bytes(me) or 0)
+            if self.server_pid:
+                self.server_peak_rss = max(self.server_peak_rss, tree_rss_bytes(self.server_pid) or 0)
+            if self._done.wait(self.interval):
+                return
+
+    def __enter__(self):
+        self.cpu0 = tree_cpu_seconds(os.getpid())
+        self.server_cpu0 = tree_cpu_seconds(self.server_pid) if self.server_pid else None
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._done.set()
+        self.join()
+        self.cpu = tree_cpu_seconds(os.getpid()) - self.cpu0
+        end = tree_cpu_seconds(self.server_pid) if self.server_pid else None
+        self.server_cpu = end - self.server_cpu0 if end is not None and self.server_cpu0 is not None else None
+        return False
+
+
+# ----------------------------------------------------
+# Arrival models
+# ----------------------------------------------------
+class Results:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies = []
+        self.errors = Counter()
+
+    def ok(self, seconds):
+        with self._lock:
+            self.latencies.append(seconds)
+
+    def fail(self, error):
+        with self._lock:
+            self.errors[str(error)[:80]] += 1
+
+
+def closed_loop(call, mix, concurrency, deadline, max_requests, results):
+    issued = [0]
+    lock = threading.Lock()
+
+    def client():
+        while time.perf_counter() < deadline:
+            with lock:
+                if max_requests and issued[0] >= max_requests:
+                    return
+                issued[0] += 1
+            rec = mix.next()
+            t = time.perf_counter()
+            try:
+                call(rec)
+                results.ok(time.perf_counter() - t)
+            except Exception as e:
+                results.fail(e)
+
+    threads = [threading.Thread(target=client, daemon=True) for _ in range(concurrency)]
+    for th in threads:
+        th.start()
+    for th in threads:
+        th.join()
+
+
+def open_loop(call, mix, concurrency, rate, deadline, max_requests, results, seed=SEED):
+    rng = random.Random(seed + 1)
+
+    def timed(rec, scheduled):
+        try:
+            call(rec)
+            results.ok(time.perf_counter() - scheduled)
+        except Exception as e:
+            results.fail(e)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        arrival = time.perf_counter()
+        sent = 0
+        while arrival < deadline and (not max_requests or sent < max_requests):
+            delay = arrival - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            pool.submit(timed, mix.next(), arrival)
+            sent += 1
+            arrival += rng.expovariate(rate)
+
+
+# ----------------------------------------------------
+# Report
+# ----------------------------------------------------
+def _ms(seconds):
+    return round(seconds * 1000, 3)
+
+
+def summarize(results, wall, sampler, args) -> dict:
+    lat = sorted(results.latencies)
+    out = {
+        "target": args.target,
+        "mode": "http" if args.url else ("processes" if args.processes else "threads"),
+        "arrival": f"open {args.rate}/s" if args.rate else f"closed x{args.concurrency}",
+        "unique": args.unique,
+        "completed": len(lat),
+        "errors": dict(results.errors),
+        "seconds": round(wall, 3),
+        "throughput_per_s": round(len(lat) / wall, 2) if wall else 0.0,
+        "cpu_seconds": round(sampler.cpu, 3),
+        "cpu_cores_used": round(sampler.cpu / wall, 2) if wall else 0.0,
+        "peak_rss_mb": round(sampler.peak_rss / 2**20, 1),
+        "loadgen_max_rss_mb": round((max_rss_bytes() or 0) / 2**20, 1),
+    }
+    if len(lat) >= 2:
+        q = statistics.quantiles(lat, n=100, method="inclusive")
+        out.update({"p50_ms": _ms(q[49]), "p95_ms": _ms(q[94]), "p99_ms": _ms(q[98]), "max_ms": _ms(lat[-1])})
+    if args.server_pid:
+        out["server_cpu_seconds"] = None if sampler.server_cpu is None else round(sampler.server_cpu, 3)
+        out["server_cpu_cores_used"] = None if sampler.server_cpu is None else round(sampler.server_cpu / wall, 2)
+        out["server_peak_rss_mb"] = round(sampler.server_peak_rss / 2**20, 1)
+    return out
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("target", choices=TARGETS)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds to generate load")
+    parser.add_argument("--requests", type=int, default=0, help="stop after this many (0 = duration only)")
+    parser.add_argument("--concurrency", type=int, default=4, help="clients (closed loop) or max in flight (open loop)")
+    parser.add_argument("--rate", type=float, default=0.0, help="open loop: Poisson arrivals per second")
+    parser.add_argument("--unique", type=float, default=0.2, help="fraction of requests with new inputs")
+    parser.add_argument("--hot", type=int, default=50, help="size of the repeated-client set")
+    parser.add_argument("--profile", default="screen", help="PDF profile for the pdf target")
+    parser.add_argument("--processes", action="store_true", help="in-process mode: run calls in a process pool")
+    parser.add_argument("--cache", metavar="DIR", help="in-process pdf: go through a ReportCache in DIR")
+    parser.add_argument("--url", help="send HTTP requests to service.py at this address instead")
+    parser.add_argument("--server-pid", type=int, help="with --url: sample this process's CPU and memory")
+    parser.add_argument("--json", help="also write the summary to this file")
+    args = parser.parse_args(argv)
+
+    mix = InputMix(args.unique, args.hot)
+    executor = None
+    if args.url:
+        call = HttpCaller(args.url, args.target, args.profile)
+    elif args.processes:
+        executor = ProcessPoolExecutor(max_workers=args.concurrency)
+        call = lambda rec: executor.submit(call_inproc, args.target, rec, args.profile, args.cache).result()
+    else:
+        call = lambda rec: call_inproc(args.target, rec, args.profile, args.cache)
+
+    # warm up outside the measurement: imports, fonts, tables, worker start-up
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        for fut in [pool.submit(call, rec) for rec in mix.hot[:args.concurrency] * 2]:
+            try:
+                fut.result()
+            except Exception as e:
+                print("Warm-up request failed:", e)
+
+    results = Results()
+    with ResourceSampler(args.server_pid) as sampler:
+        start = time.perf_counter()
+        deadline = start + args.duration
+        if args.rate > 0:
+            open_loop(call, mix, args.concurrency, args.rate, deadline, args.requests, results)
+        else:
+            closed_loop(call, mix, args.concurrency, deadline, args.requests, results)
+        wall = time.perf_counter() - start
+
+    if executor:
+        executor.shutdown()
+
+    summary = summarize(results, wall, sampler, args)
+    width = max(len(k) for k in summary)
+    for key, value in summary.items():
+        print(f"{key:<{width}}  {value}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as fh:
+            json.dump(summary, fh, indent=2)
+    return 1 if results.errors and not results.latencies else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,248 @@
+# benchmarks/run.py — HOT-PATH BENCHMARKS WITH REGRESSION THRESHOLDS
+"""
+Times every hot path over fixed synthetic inputs and compares the median
+latency with benchmarks/baseline.json.
+
+Paths: calculate_all, name_to_chaldean_number, get_phase_analysis,
+render_loshu_grid (520 and 800 px), PNG encoding, create_pdf_report and
+the import time of `core` and `ui` (via importtime.py).
+
+For each path it reports throughput and p50/p95/p99 latency, and fails
+(exit 1) when a p50 is more than --threshold above its baseline and also
+more than --floor µs slower. The paths that take a few µs are timed in
+batches of MICRO_BATCH calls per sample, so timer overhead and scheduler
+jitter don't dominate them. Baselines are machine-specific: re-run with
+--update on the reference machine after an intended change.
+
+Run from the app folder:
+    python benchmarks/run.py                  # all, compare with baseline
+    python benchmarks/run.py --only pdf       # names containing "pdf"
+    python benchmarks/run.py --quick          # fewer iterations, for a smoke check
+    python benchmarks/run.py --update         # rewrite baseline.json
+"""
+
+import argparse
+import io
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+APP_DIR = os.path.dirname(HERE)
+BASELINE_FILE = os.path.join(HERE, "baseline.json")
+THRESHOLD = 0.25   # allowed p50 slowdown over baseline
+FLOOR_US = 1.0     # p50 slowdowns smaller than this are noise, whatever the percentage
+MICRO_BATCH = 100  # calls per sample for the µs-scale paths
+SEED = 20240101
+
+sys.path.insert(0, APP_DIR)
+sys.path.insert(0, HERE)
+os.chdir(APP_DIR)   # the grid renderer loads assets/ relative to the app folder
+
+BENCHMARKS = {}     # name -> fn(scale) returning per-operation durations in seconds
+
+
+def bench(name):
+    def register(fn):
+        BENCHMARKS[name] = fn
+        return fn
+    return register
+
+
+# ----------------------------------------------------
+# Fixed synthetic data
+# ----------------------------------------------------
+FIRST = ["Aarav", "Priya", "Rahul", "Ananya", "Vikram", "Sneha", "Arjun", "Kavya", "Rohan", "Isha",
+         "John", "Maria", "Chen", "Fatima", "Olga", "Kwame"]
+LAST = ["Sharma", "Verma", "Iyer", "Patel", "Gupta", "Reddy", "Nair", "Singh", "Khan", "Das",
+        "Smith", "Garcia", "Wong", "Haddad", "Petrova", "Mensah"]
+GENDERS = ["Male", "Female", "Other"]
+
+
+def dataset(n: int):
+    """[(name, dob, gender)] — the same n records on every run and machine."""
+    rng = random.Random(SEED)
+    start = date(1940, 1, 1)
+    return [
+        (f"{rng.choice(FIRST)} {rng.choice(LAST)}", start + timedelta(days=rng.randrange(30000)), rng.choice(GENDERS))
+        for _ in range(n)
+    ]
+
+
+def _time_each(fn, items, batch=1):
+    """Seconds per call; with batch > 1, each sample is the mean of `batch` consecutive calls."""
+    out = []
+    clock = time.perf_counter
+    for i in range(0, len(items) - batch + 1, batch):
+        chunk = items[i:i + batch]
+        t = clock()
+        for item in chunk:
+            fn(item)
+        out.append((clock() - t) / batch)
+    return out
+
+
+# ----------------------------------------------------
+# Paths
+# ----------------------------------------------------
+@bench("calculate_all")
+def bench_calculate_all(scale):
+    from core.numerology_calculations import calculate_all
+
+    data = dataset(int(20000 * scale))
+    return _time_each(lambda rec: calculate_all(*rec), data, MICRO_BATCH)
+
+
+@bench("name_to_chaldean_number")
+def bench_chaldean(scale):
+    from core.chaldean_mapping import name_to_chaldean_number
+
+    names = [rec[0] for rec in dataset(int(20000 * scale))]
+    return _time_each(name_to_chaldean_number, names, MICRO_BATCH)
+
+
+@bench("get_phase_analysis")
+def bench_phases(scale):
+    from core.driver_conductor import get_phase_analysis
+
+    rng = random.Random(SEED)
+    pairs = [(rng.randint(1, 9), rng.randint(1, 9)) for _ in range(int(20000 * scale))]
+    return _time_each(lambda p: get_phase_analysis(*p), pairs, MICRO_BATCH)
+
+
+def _grid_digits(n):
+    from core.numerology_calculations import calculate_all
+    from core.loshu import loshu_digits
+
+    return [loshu_digits(dob, calculate_all(name, dob, gender)) for name, dob, gender in dataset(n)]
+
+
+@bench("render_loshu_grid_520")
+def bench_grid_520(scale):
+    from core.loshu import render_loshu_grid
+
+    return _time_each(lambda d: render_loshu_grid(d, size=520), _grid_digits(max(3, int(12 * scale))))
+
+
+@bench("render_loshu_grid_800")
+def bench_grid_800(scale):
+    from core.loshu import render_loshu_grid
+
+    return _time_each(lambda d: render_loshu_grid(d, size=800), _grid_digits(max(3, int(8 * scale))))
+
+
+@bench("png_encode_800")
+def bench_png(scale):
+    from core.loshu import render_loshu_grid
+
+    img = render_loshu_grid(_grid_digits(1)[0], size=800)
+    return _time_each(lambda _: img.save(io.BytesIO(), format="PNG"), range(max(3, int(10 * scale))))
+
+
+@bench("create_pdf_report")
+def bench_pdf(scale):
+    from core.pdf_report import create_pdf_report
+    from core.reports import build_payload
+
+    grid_dir = tempfile.mkdtemp(prefix="bench_grids_")
+    payloads = [build_payload(*rec, grid_dir=grid_dir) for rec in dataset(max(3, int(10 * scale)))]
+    create_pdf_report(io.BytesIO(), payloads[0])   # fonts and caches warm, as in a running app
+    return _time_each(lambda p: create_pdf_report(io.BytesIO(), p), payloads)
+
+
+def _bench_import(module):
+    def run(scale):
+        from importtime import measure
+
+        runs = max(3, int(7 * scale))
+        return [measure(module, runs=1)[0] / 1e6 for _ in range(runs)]
+    return run
+
+
+BENCHMARKS["import_core"] = _bench_import("core")
+BENCHMARKS["import_ui"] = _bench_import("ui")
+
+
+# ----------------------------------------------------
+# Runner
+# ----------------------------------------------------
+def summarize(samples) -> dict:
+    q = statistics.quantiles(samples, n=100, method="inclusive")
+    return {
+        "n": len(samples),
+        "ops_per_s": round(len(samples) / sum(samples), 1),
+        "p50_us": round(q[49] * 1e6, 2),
+        "p95_us": round(q[94] * 1e6, 2),
+        "p99_us": round(q[98] * 1e6, 2),
+    }
+
+
+def _fmt_us(us):
+    if us >= 1000:
+        return f"{us / 1000:9.2f} ms"
+    return f"{us:9.2f} µs"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--only", help="run benchmarks whose name contains this")
+    parser.add_argument("--quick", action="store_true", help="a fifth of the iterations")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD, help="allowed p50 slowdown (0.25 = 25%%)")
+    parser.add_argument("--floor", type=float, default=FLOOR_US, help="ignore p50 slowdowns under this many µs")
+    parser.add_argument("--update", action="store_true", help="rewrite baseline.json from this run")
+    parser.add_argument("--json", help="also write this run's results to a file")
+    args = parser.parse_args(argv)
+
+    baseline = {}
+    if os.path.exists(BASELINE_FILE):
+        with open(BASELINE_FILE, encoding="utf-8") as fh:
+            baseline = json.load(fh)
+
+    scale = 0.2 if args.quick else 1.0
+    results = {}
+    failed = False
+
+    print(f"{'benchmark':<26}{'ops/s':>12}{'p50':>13}{'p95':>13}{'p99':>13}   vs baseline")
+    for name, fn in BENCHMARKS.items():
+        if args.only and args.only not in name:
+            continue
+        # one untimed pass at small scale: imports, font loading, table parsing
+        fn(0.01)
+        stats = results[name] = summarize(fn(scale))
+
+        base = baseline.get(name)
+        if base is None:
+            verdict = "no baseline"
+        else:
+            change = stats["p50_us"] / base["p50_us"] - 1
+            verdict = f"{change:+6.1%}"
+            slower_us = stats["p50_us"] - base["p50_us"]
+            if change > args.threshold and slower_us > args.floor and not args.update:
+                verdict += "  REGRESSION"
+                failed = True
+
+        print(f"{name:<26}{stats['ops_per_s']:>12,.1f}{_fmt_us(stats['p50_us'])}"
+              f"{_fmt_us(stats['p95_us'])}{_fmt_us(stats['p99_us'])}   {verdict}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as fh:
+            json.dump(results, fh, indent=2)
+
+    if args.update:
+        baseline.update(results)
+        with open(BASELINE_FILE, "w", encoding="utf-8") as fh:
+            json.dump(baseline, fh, indent=2)
+            fh.write("\n")
+        print("baseline updated")
+        return 0
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
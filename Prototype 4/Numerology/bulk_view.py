@@ -0,0 +1,310 @@
+# bulk_view.py — VIRTUALIZED CLIENT TABLE (CSV → numbers, sort, filter, thumbnails)
+
+from array import array
+from collections import OrderedDict
+
+from PySide6.QtWidgets import (
+    QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QTableView, QPushButton,
+    QLabel, QComboBox, QDoubleSpinBox, QLineEdit, QFileDialog, QMessageBox,
+    QHeaderView, QAbstractItemView
+)
+from PySide6.QtGui import QPixmap
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex, QThreadPool, QSize
+
+from core.bulk import read_clients_csv
+from workers import Worker, thumbnail_job
+
+THUMB_SIZE = 56
+
+# (header, kind) — kind picks how data() fills the cell
+COLUMNS = [
+    ("Grid", "thumb"),
+    ("Name", "name"),
+    ("DOB", "dob"),
+    ("Gender", "gender"),
+    ("Mulank", "mulank"),
+    ("Bhagyank", "bhagyank"),
+    ("Name No.", "name_number"),
+    ("Angel", "angel"),
+    ("Rating 0–40", "rating"),
+    ("Keywords 0–40", "keywords"),
+]
+
+
+class ClientTableModel(QAbstractTableModel):
+    """
+    Table over core.bulk.ClientColumns. Only rows Qt asks for are computed;
+    sorting and filtering work on an index array of data rows, so the view
+    never touches the underlying columns' order.
+    """
+
+    THUMB_CACHE_SIZE = 512
+
+    def __init__(self, cols, parent=None):
+        super().__init__(parent)
+        self.cols = cols
+        self._rows = array("l", range(len(cols)))   # view row -> data row
+        self._thumbs = OrderedDict()                # frequency vector -> QPixmap
+        self._pending = {}                          # frequency vector -> Worker
+        self._sort = None                           # (column, order) of the active sort
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(2)
+        self._job_counter = 0
+
+    # ----------------------------------------------------
+    # Qt model API
+    # ----------------------------------------------------
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return COLUMNS[section][0]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        i = self._rows[index.row()]
+        kind = COLUMNS[index.column()][1]
+
+        if kind == "thumb":
+            if role == Qt.DecorationRole:
+                return self._thumbnail(i)
+            if role == Qt.SizeHintRole:
+                return QSize(THUMB_SIZE, THUMB_SIZE)
+            return None
+
+        if role != Qt.DisplayRole:
+            return None
+
+        cols = self.cols
+        if kind == "name":
+            return cols.names[i]
+        if kind == "dob":
+            return cols.dobs[i].strftime("%d-%m-%Y")
+        if kind == "gender":
+            return cols.genders[i]
+        if kind == "rating":
+            return cols.phase(i)["rating_clean"]
+        if kind == "keywords":
+            return ", ".join(cols.phase(i)["meaning_clean"])
+
+        cols.ensure_row(i)
+        return int(getattr(cols, kind)[i])
+
+    # ----------------------------------------------------
+    # Thumbnails — rendered off-thread, cached per frequency vector
+    # ----------------------------------------------------
+    def _thumbnail(self, i):
+        freq = self.cols.frequency(i)
+        pix = self._thumbs.get(freq)
+        if pix is not None:
+            self._thumbs.move_to_end(freq)
+            return pix
+
+        if freq not in self._pending:
+            self._job_counter += 1
+            worker = Worker(self._job_counter, thumbnail_job, freq, THUMB_SIZE)
+            worker.signals.result.connect(lambda _id, img, f=freq: self._on_thumbnail(f, img))
+            # a failed render may be retried the next time the row is painted
+            worker.signals.error.connect(lambda _id, msg, f=freq: self._pending.pop(f, None))
+            self._pending[freq] = worker
+            self._pool.start(worker)
+        return None
+
+    def shutdown(self):
+        """Drop queued renders and wait for running ones before the model goes away."""
+        self._pool.clear()
+        self._pool.waitForDone()
+        self._pending.clear()
+
+    def _on_thumbnail(self, freq, qimage):
+        self._pending.pop(freq, None)
+        self._thumbs[freq] = QPixmap.fromImage(qimage)
+        while len(self._thumbs) > self.THUMB_CACHE_SIZE:
+            self._thumbs.popitem(last=False)
+
+        # repaint only the first column; the view asks again for visible rows
+        top = self.index(0, 0)
+        bottom = self.index(max(0, len(self._rows) - 1), 0)
+        self.dataChanged.emit(top, bottom, [Qt.DecorationRole])
+
+    # ----------------------------------------------------
+    # Sort / filter
+    # ----------------------------------------------------
+    def _sort_key(self, kind):
+        cols = self.cols
+        if kind in ("mulank", "bhagyank", "angel"):
+            cols.ensure_all(name=False)
+            arr = getattr(cols, kind)
+            return arr.__getitem__
+        if kind in ("name_number",):
+            cols.ensure_all(dob=False)
+            return cols.name_number.__getitem__
+        if kind == "rating":
+            cols.ensure_all(name=False)
+            return lambda i: cols.phase(i)["rating_clean"] or 0.0
+        if kind == "name":
+            return lambda i: cols.names[i].casefold()
+        if kind == "dob":
+            return cols.dobs.__getitem__
+        if kind == "gender":
+            return cols.genders.__getitem__
+        if kind == "keywords":
+            return lambda i: ", ".join(cols.phase(i)["meaning_clean"])
+        return None
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        key = self._sort_key(COLUMNS[column][1])
+        if key is None:
+            return
+        self._sort = (column, order)
+        self.layoutAboutToBeChanged.emit()
+        rows = sorted(self._rows, key=key, reverse=order == Qt.DescendingOrder)
+        self._rows = array("l", rows)
+        self.layoutChanged.emit()
+
+    def set_filter(self, mulank=None, bhagyank=None, min_rating=None, keyword=None):
+        """Keep rows matching every given criterion; None means "any"."""
+        from core.driver_conductor import DATA
+
+        cols = self.cols
+        cols.ensure_all(name=False)
+
+        # Rating and keywords depend only on (mulank, bhagyank): resolve them
+        # once over the 81 combinations, then filter rows by pair.
+        allowed = None
+        if min_rating is not None or keyword:
+            kw = (keyword or "").casefold()
+            allowed = set()
+            for pair, entry in DATA.items():
+                if min_rating is not None and (entry["rating_clean"] or 0.0) < min_rating:
+                    continue
+                if kw and not any(kw in k.casefold() for k in entry["meaning_clean"]):
+                    continue
+                allowed.add(pair)
+
+        rows = array("l")
+        for i in range(len(cols)):
+            m, b = cols.mulank[i], cols.bhagyank[i]
+            if mulank is not None and m != mulank:
+                continue
+            if bhagyank is not None and b != bhagyank:
+                continue
+            if allowed is not None and (m, b) not in allowed:
+                continue
+            rows.append(i)
+
+        # keep the order the header's sort indicator shows
+        if self._sort is not None:
+            column, order = self._sort
+            rows = array("l", sorted(rows, key=self._sort_key(COLUMNS[column][1]),
+                                     reverse=order == Qt.DescendingOrder))
+
+        self.beginResetModel()
+        self._rows = rows
+        self.endResetModel()
+
+
+class BulkWindow(QMainWindow):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Bulk Clients")
+        self.resize(1100, 700)
+        self.model = None
+
+        root = QWidget()
+        layout = QVBoxLayout(root)
+
+        bar = QHBoxLayout()
+        open_btn = QPushButton("Open CSV…")
+        open_btn.clicked.connect(self.open_csv)
+        bar.addWidget(open_btn)
+
+        self.mulank_filter = self._number_filter()
+        self.bhagyank_filter = self._number_filter()
+        self.rating_filter = QDoubleSpinBox()
+        self.rating_filter.setRange(0, 5)
+        self.rating_filter.setSingleStep(0.5)
+        self.keyword_filter = QLineEdit()
+        self.keyword_filter.setPlaceholderText("Keyword…")
+
+        for text, w in (("Mulank", self.mulank_filter), ("Bhagyank", self.bhagyank_filter),
+                        ("Min rating", self.rating_filter), ("", self.keyword_filter)):
+            if text:
+                bar.addWidget(QLabel(text))
+            bar.addWidget(w)
+
+        apply_btn = QPushButton("Filter")
+        apply_btn.clicked.connect(self.apply_filter)
+        bar.addWidget(apply_btn)
+        bar.addStretch(1)
+
+        self.count_label = QLabel("No file loaded")
+        bar.addWidget(self.count_label)
+        layout.addLayout(bar)
+
+        self.table = QTableView()
+        self.table.setSortingEnabled(True)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setIconSize(QSize(THUMB_SIZE, THUMB_SIZE))
+        # fixed row heights keep scrolling O(visible rows)
+        vh = self.table.verticalHeader()
+        vh.setSectionResizeMode(QHeaderView.Fixed)
+        vh.setDefaultSectionSize(THUMB_SIZE + 4)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        layout.addWidget(self.table)
+
+        self.setCentralWidget(root)
+
+    def _number_filter(self):
+        box = QComboBox()
+        box.addItem("Any", None)
+        for n in range(1, 10):
+            box.addItem(str(n), n)
+        return box
+
+    def open_csv(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Open Clients CSV", "", "CSV Files (*.csv)")
+        if path:
+            self.load(path)
+
+    def load(self, path):
+        try:
+            cols = read_clients_csv(path)
+        except Exception as e:
+            QMessageBox.critical(self, "Load Error", f"Failed to read CSV:\n{e}")
+            return
+
+        if self.model:
+            self.model.shutdown()
+        self.model = ClientTableModel(cols, self)
+        self.table.setModel(self.model)
+        self.table.setColumnWidth(0, THUMB_SIZE + 8)
+        self._update_count()
+        if cols.skipped:
+            QMessageBox.information(self, "Skipped rows", f"{cols.skipped} rows had an unreadable DOB.")
+
+    def apply_filter(self):
+        if not self.model:
+            return
+        rating = self.rating_filter.value()
+        self.model.set_filter(
+            mulank=self.mulank_filter.currentData(),
+            bhagyank=self.bhagyank_filter.currentData(),
+            min_rating=rating if rating > 0 else None,
+            keyword=self.keyword_filter.text().strip() or None,
+        )
+        self._update_count()
+
+    def closeEvent(self, event):
+        if self.model:
+            self.model.shutdown()
+        super().closeEvent(event)
+
+    def _update_count(self):
+        self.count_label.setText(f"{self.model.rowCount():,} of {len(self.model.cols):,} clients")
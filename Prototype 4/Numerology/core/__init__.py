@@ -1,6 +1,14 @@
 # core/__init__.py
-# Expose core utilities if needed
-from .loshu import render_loshu_grid
+# Expose core utilities if needed.
+# Importing `core` stays light: no PIL, reportlab or Qt until a renderer is used.
 from .numerology_calculations import (
     compute_mulank, compute_bhagyank, compute_name_number, compute_angel_number
 )
+
+
+def __getattr__(name):
+    # render_loshu_grid pulls in PIL on first use only
+    if name == "render_loshu_grid":
+        from .loshu import render_loshu_grid
+        return render_loshu_grid
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,141 @@
+# core/bulk.py
+"""
+Columnar client lists for bulk work.
+Provides:
+  - read_clients_csv(path) -> ClientColumns
+  - ClientColumns: inputs as parallel lists, results as typed arrays that are
+    filled lazily (per row, or per column when sorting/filtering needs it)
+"""
+
+import csv
+from array import array
+from datetime import date, datetime
+
+from .numerology_calculations import (
+    compute_mulank, compute_bhagyank, compute_name_number, compute_angel_number
+)
+from .loshu import loshu_digits, frequency_vector
+
+NOT_COMPUTED = -1
+DOB_FORMATS = ("%d-%m-%Y", "%Y-%m-%d", "%d/%m/%Y", "%d.%m.%Y")
+
+
+def parse_dob(text: str) -> date:
+    text = text.strip()
+    for fmt in DOB_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).date()
+        except ValueError:
+            continue
+    raise ValueError(f"Unrecognised date of birth: {text!r}")
+
+
+def read_clients_csv(path: str) -> "ClientColumns":
+    """
+    Read a CSV with `name`, `dob` and optional `gender` columns (header
+    names are case-insensitive). Rows with a bad DOB are skipped and counted
+    in `ClientColumns.skipped`; `ClientColumns.lines` keeps each client's
+    line number in the file, so later rows keep theirs when one is fixed.
+    """
+    names, dobs, genders, lines = [], [], [], array("l")
+    skipped = 0
+
+    with open(path, newline="", encoding="utf-8-sig") as fh:
+        reader = csv.DictReader(fh)
+        fields = {f.strip().lower(): f for f in reader.fieldnames or []}
+        if "name" not in fields or "dob" not in fields:
+            raise ValueError("CSV needs 'name' and 'dob' columns")
+        gender_field = fields.get("gender")
+
+        for row in reader:
+            try:
+                dob = parse_dob(row[fields["dob"]] or "")
+            except ValueError:
+                skipped += 1
+                continue
+            names.append((row[fields["name"]] or "").strip())
+            dobs.append(dob)
+            genders.append(((row.get(gender_field) if gender_field else None) or "Other").strip().capitalize())
+            lines.append(reader.line_num)
+
+    cols = ClientColumns(names, dobs, genders)
+    cols.skipped = skipped
+    cols.lines = lines
+    return cols
+
+
+class ClientColumns:
+    """Inputs plus lazily computed result columns, one entry per client."""
+
+    def __init__(self, names, dobs, genders):
+        n = len(names)
+        self.names = names
+        self.dobs = dobs
+        self.genders = genders
+        self.skipped = 0
+        self.lines = None   # CSV line of each client, when read from a file
+
+        self.mulank = array("b", [NOT_COMPUTED]) * n
+        self.bhagyank = array("b", [NOT_COMPUTED]) * n
+        self.name_total = array("l", [NOT_COMPUTED]) * n
+        self.name_number = array("b", [NOT_COMPUTED]) * n
+        self.angel = array("b", [NOT_COMPUTED]) * n
+        self._freq = [None] * n
+
+    def __len__(self):
+        return len(self.names)
+
+    # ----------------------------------------------------
+    # Lazy computation
+    # ----------------------------------------------------
+    def ensure_dob(self, i: int):
+        if self.mulank[i] == NOT_COMPUTED:
+            dob = self.dobs[i]
+            self.mulank[i] = compute_mulank(dob)
+            self.bhagyank[i] = compute_bhagyank(dob)
+            self.angel[i] = compute_angel_number(dob, self.genders[i])
+
+    def ensure_name(self, i: int):
+        if self.name_number[i] == NOT_COMPUTED:
+            total, reduced = compute_name_number(self.names[i])
+            self.name_total[i] = total
+            self.name_number[i] = reduced
+
+    def ensure_row(self, i: int):
+        self.ensure_dob(i)
+        self.ensure_name(i)
+
+    def ensure_all(self, dob=True, name=True):
+        """Fill whole columns — needed before sorting or filtering on them."""
+        for i in range(len(self)):
+            if dob:
+                self.ensure_dob(i)
+            if name:
+                self.ensure_name(i)
+
+    # ----------------------------------------------------
+    # Derived values
+    # ----------------------------------------------------
+    def results(self, i: int) -> dict:
+        self.ensure_row(i)
+        return {
+            "Mulank": self.mulank[i],
+            "Bhagyank": self.bhagyank[i],
+            "Name Total": self.name_total[i],
+            "Name Number": self.name_number[i],
+            "Angel Number": self.angel[i],
+        }
+
+    def phase(self, i: int, phase: str = "0-40") -> dict:
+        from .driver_conductor import get_dc_analysis
+
+        self.ensure_dob(i)
+        m, b = self.mulank[i], self.bhagyank[i]
+        return get_dc_analysis(m, b) if phase == "0-40" else get_dc_analysis(b, m)
+
+    def frequency(self, i: int) -> tuple:
+        """Lo Shu frequency vector; rows sharing one render the same grid."""
+        freq = self._freq[i]
+        if freq is None:
+            freq = self._freq[i] = frequency_vector(loshu_digits(self.dobs[i], self.results(i)))
+        return freq
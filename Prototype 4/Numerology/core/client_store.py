@@ -0,0 +1,366 @@
+# core/client_store.py
+"""
+Local client-record store (replaces the MongoDB `User` collection of
+AnkCoder_Prototype2/server.js).
+Provides:
+  - ClientStore(path): insert_many(records) / add_columns(cols) / update / delete /
+    find(...) / count(...) / get(id)
+  - distribution queries: pair_counts() / month_ratings() / missing_counts() / total()
+  - client_record(name, dob, gender, mobile): one row computed by the calculation engine
+
+Field mapping from the Mongo schema: firstName/middleName/lastName -> name,
+moolank and dobNumber -> mulank, destiny -> bhagyank, nameNumber ->
+name_number, mob -> mobile.
+
+Inserts go through executemany in one transaction per chunk. A load into an
+empty table drops the secondary indexes and rebuilds them once at the end,
+which is much faster than maintaining them row by row. Filters use the
+(mulank, bhagyank) and name_number indexes; every query is one of a fixed
+set of SQL strings, so sqlite3 reuses its prepared statements.
+
+Dashboard distributions live in small aggregate tables (one row per
+Mulank/Bhagyank pair, birth month and missing digit) kept current by
+triggers on insert, update and delete, so reading them never touches the
+clients table. Deferred bulk loads drop the triggers too and rebuild the
+aggregates with one scan at the end.
+"""
+
+import os
+import sqlite3
+from datetime import date
+from itertools import islice
+
+from .numerology_calculations import calculate_all
+from .loshu import loshu_digits, frequency_vector, missing_mask
+from .util import app_data_dir
+
+SCHEMA_VERSION = 2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS clients (
+    id           INTEGER PRIMARY KEY,
+    name         TEXT NOT NULL,
+    dob          TEXT NOT NULL,         -- ISO yyyy-mm-dd
+    gender       TEXT NOT NULL,
+    mobile       TEXT,
+    mulank       INTEGER NOT NULL,
+    bhagyank     INTEGER NOT NULL,
+    name_total   INTEGER NOT NULL,
+    name_number  INTEGER NOT NULL,
+    angel        INTEGER NOT NULL
+);
+"""
+
+INDEXES = """
+-- (mulank, bhagyank) filters use the prefix; adding name_number covers all three at once
+CREATE INDEX IF NOT EXISTS idx_clients_mb ON clients (mulank, bhagyank, name_number);
+CREATE INDEX IF NOT EXISTS idx_clients_name_number ON clients (name_number);
+"""
+
+DROP_INDEXES = """
+DROP INDEX IF EXISTS idx_clients_mb;
+DROP INDEX IF EXISTS idx_clients_name_number;
+"""
+
+# version 2: per-row inputs of the aggregates
+SCHEMA_V2 = """
+ALTER TABLE clients ADD COLUMN rating REAL;                              -- 0-40 driver-conductor rating
+ALTER TABLE clients ADD COLUMN birth_month INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE clients ADD COLUMN missing_mask INTEGER NOT NULL DEFAULT 0;  -- bit n-1: n absent from Lo Shu grid
+
+CREATE TABLE IF NOT EXISTS agg_pairs (
+    mulank    INTEGER NOT NULL,
+    bhagyank  INTEGER NOT NULL,
+    n         INTEGER NOT NULL,
+    PRIMARY KEY (mulank, bhagyank)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS agg_months (
+    month       INTEGER PRIMARY KEY,
+    n           INTEGER NOT NULL,
+    rating_n    INTEGER NOT NULL,    -- clients with a rating
+    rating_sum  REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS agg_missing (
+    digit  INTEGER PRIMARY KEY,
+    n      INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO agg_missing (digit, n) VALUES (1,0),(2,0),(3,0),(4,0),(5,0),(6,0),(7,0),(8,0),(9,0);
+"""
+
+_ADD_ROW = """
+    INSERT INTO agg_pairs (mulank, bhagyank, n) VALUES (NEW.mulank, NEW.bhagyank, 1)
+        ON CONFLICT (mulank, bhagyank) DO UPDATE SET n = n + 1;
+    INSERT INTO agg_months (month, n, rating_n, rating_sum)
+        VALUES (NEW.birth_month, 1, NEW.rating IS NOT NULL, COALESCE(NEW.rating, 0))
+        ON CONFLICT (month) DO UPDATE SET
+            n = n + 1,
+            rating_n = rating_n + excluded.rating_n,
+            rating_sum = rating_sum + excluded.rating_sum;
+    UPDATE agg_missing SET n = n + 1 WHERE (NEW.missing_mask >> (digit - 1)) & 1;
+"""
+
+_REMOVE_ROW = """
+    UPDATE agg_pairs SET n = n - 1 WHERE mulank = OLD.mulank AND bhagyank = OLD.bhagyank;
+    UPDATE agg_months SET
+        n = n - 1,
+        rating_n = rating_n - (OLD.rating IS NOT NULL),
+        rating_sum = rating_sum - COALESCE(OLD.rating, 0)
+    WHERE month = OLD.birth_month;
+    UPDATE agg_missing SET n = n - 1 WHERE (OLD.missing_mask >> (digit - 1)) & 1;
+"""
+
+TRIGGERS = f"""
+CREATE TRIGGER IF NOT EXISTS trg_clients_insert AFTER INSERT ON clients BEGIN {_ADD_ROW} END;
+CREATE TRIGGER IF NOT EXISTS trg_clients_delete AFTER DELETE ON clients BEGIN {_REMOVE_ROW} END;
+CREATE TRIGGER IF NOT EXISTS trg_clients_update
+    AFTER UPDATE OF mulank, bhagyank, rating, birth_month, missing_mask ON clients
+BEGIN {_REMOVE_ROW} {_ADD_ROW} END;
+"""
+
+DROP_TRIGGERS = """
+DROP TRIGGER IF EXISTS trg_clients_insert;
+DROP TRIGGER IF EXISTS trg_clients_delete;
+DROP TRIGGER IF EXISTS trg_clients_update;
+"""
+
+# one scan per table: used after deferred loads and by the v2 migration
+REBUILD_AGGREGATES = """
+DELETE FROM agg_pairs;
+INSERT INTO agg_pairs (mulank, bhagyank, n)
+    SELECT mulank, bhagyank, COUNT(*) FROM clients GROUP BY mulank, bhagyank;
+DELETE FROM agg_months;
+INSERT INTO agg_months (month, n, rating_n, rating_sum)
+    SELECT birth_month, COUNT(*), COUNT(rating), COALESCE(SUM(rating), 0) FROM clients GROUP BY birth_month;
+""" + "".join(
+    f"UPDATE agg_missing SET n = (SELECT COUNT(*) FROM clients WHERE missing_mask & {1 << (d - 1)}) WHERE digit = {d};\n"
+    for d in range(1, 10)
+)
+
+COLUMNS = ("name", "dob", "gender", "mobile", "mulank", "bhagyank", "name_total", "name_number", "angel",
+           "rating", "birth_month", "missing_mask")
+
+INSERT_SQL = f"INSERT INTO clients ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})"
+
+CHUNK_SIZE = 50_000
+REBUILD_INDEXES_AT = 10_000   # loads into an empty table at least this big defer index builds
+
+
+# ----------------------------------------------------
+# Prepared filters
+# ----------------------------------------------------
+FILTERS = ("mulank", "bhagyank", "name_number")
+
+
+def _where(mask):
+    terms = [f"{col} = ?" for col, used in zip(FILTERS, mask) if used]
+    return (" WHERE " + " AND ".join(terms)) if terms else ""
+
+
+def _masks():
+    for bits in range(1 << len(FILTERS)):
+        yield tuple(bool(bits & (1 << i)) for i in range(len(FILTERS)))
+
+
+# one SQL string per combination of filters — never built per call
+FIND_SQL = {
+    mask: f"SELECT id, {', '.join(COLUMNS)} FROM clients{_where(mask)} ORDER BY id LIMIT ? OFFSET ?"
+    for mask in _masks()
+}
+COUNT_SQL = {mask: f"SELECT COUNT(*) FROM clients{_where(mask)}" for mask in _masks()}
+GET_SQL = f"SELECT id, {', '.join(COLUMNS)} FROM clients WHERE id = ?"
+# filters without name_number are summed from agg_pairs (at most 81 rows)
+PAIR_COUNT_SQL = {
+    mask: f"SELECT COALESCE(SUM(n), 0) FROM agg_pairs{_where(mask)}" for mask in _masks() if not mask[2]
+}
+UPDATE_SQL = f"UPDATE clients SET {', '.join(c + ' = ?' for c in COLUMNS)} WHERE id = ?"
+
+
+def client_record(name: str, dob: date, gender: str, mobile: str = None) -> tuple:
+    """Row for insert_many(), computed by calculate_all()."""
+    from .driver_conductor import get_dc_analysis
+
+    r = calculate_all(name, dob, gender)
+    freq = frequency_vector(loshu_digits(dob, r))
+    return (name, dob.isoformat(), gender, mobile, r["Mulank"], r["Bhagyank"],
+            r["Name Total"], r["Name Number"], r["Angel Number"],
+            get_dc_analysis(r["Mulank"], r["Bhagyank"])["rating_clean"], dob.month, missing_mask(freq))
+
+
+def _statements(script: str):
+    """Split an SQL script into single statements; trigger bodies keep their inner semicolons."""
+    buf = ""
+    for line in script.splitlines(keepends=True):
+        buf += line
+        if sqlite3.complete_statement(buf):
+            yield buf.strip()
+            buf = ""
+    if buf.strip():
+        yield buf.strip()
+
+
+class ClientStore:
+    def __init__(self, path: str = None):
+        self.path = path or os.path.join(app_data_dir(), "clients.db")
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, cached_statements=64)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._migrate()
+
+    def _migrate(self):
+        """
+        Bring the schema up to SCHEMA_VERSION. Each step, its backfill and its
+        user_version bump commit together (executescript would commit every
+        ALTER on its own), so a crash mid-step leaves the previous version.
+        """
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version < 1:
+            self._in_transaction(SCHEMA + INDEXES + "PRAGMA user_version = 1;")
+        if version < 2:
+            self._in_transaction(SCHEMA_V2, self._backfill_v2,
+                                 REBUILD_AGGREGATES + TRIGGERS + "PRAGMA user_version = 2;")
+
+    def _in_transaction(self, *steps):
+        """Run SQL scripts and callables in one transaction; roll back on any error."""
+        self._conn.execute("BEGIN")
+        try:
+            for step in steps:
+                if callable(step):
+                    step()
+                    continue
+                for sql in _statements(step):
+                    self._conn.execute(sql)
+        except BaseException:
+            self._conn.rollback()
+            raise
+        self._conn.commit()
+
+    def _backfill_v2(self):
+        """Fill rating, birth_month and missing_mask for rows stored before version 2 (no commit)."""
+        from .driver_conductor import get_dc_analysis
+
+        rows = self._conn.execute(
+            "SELECT id, dob, mulank, bhagyank, angel FROM clients"
+        ).fetchall()
+        updates = []
+        for row in rows:
+            dob = date.fromisoformat(row["dob"])
+            results = {"Mulank": row["mulank"], "Bhagyank": row["bhagyank"], "Angel Number": row["angel"]}
+            freq = frequency_vector(loshu_digits(dob, results))
+            rating = get_dc_analysis(row["mulank"], row["bhagyank"])["rating_clean"]
+            updates.append((rating, dob.month, missing_mask(freq), row["id"]))
+        self._conn.executemany(
+            "UPDATE clients SET rating = ?, birth_month = ?, missing_mask = ? WHERE id = ?", updates
+        )
+
+    def close(self):
+        self._conn.close()
+
+    # ----------------------------------------------------
+    # Insert
+    # ----------------------------------------------------
+    def insert_many(self, records, chunk_size: int = CHUNK_SIZE, expected: int = None) -> int:
+        """
+        Insert row tuples (see client_record / COLUMNS) in transactional
+        chunks and return how many were inserted. Pass `expected` when the
+        size is known so a large first load can defer its index builds.
+        """
+        defer = expected is not None and expected >= REBUILD_INDEXES_AT and self.total() == 0
+        if defer:
+            self._conn.executescript(DROP_INDEXES + DROP_TRIGGERS)
+
+        inserted = 0
+        it = iter(records)
+        try:
+            while True:
+                chunk = list(islice(it, chunk_size))
+                if not chunk:
+                    break
+                with self._conn:
+                    self._conn.executemany(INSERT_SQL, chunk)
+                inserted += len(chunk)
+        finally:
+            if defer:
+                self._conn.executescript(INDEXES + REBUILD_AGGREGATES + TRIGGERS)
+                self._conn.execute("ANALYZE clients")
+        return inserted
+
+    def add(self, name: str, dob: date, gender: str, mobile: str = None) -> int:
+        with self._conn:
+            cur = self._conn.execute(INSERT_SQL, client_record(name, dob, gender, mobile))
+        return cur.lastrowid
+
+    def update(self, client_id: int, name: str, dob: date, gender: str, mobile: str = None) -> bool:
+        """Replace a client's inputs and recompute its numbers. False if the id doesn't exist."""
+        with self._conn:
+            cur = self._conn.execute(UPDATE_SQL, (*client_record(name, dob, gender, mobile), client_id))
+        return cur.rowcount > 0
+
+    def delete(self, client_id: int) -> bool:
+        with self._conn:
+            cur = self._conn.execute("DELETE FROM clients WHERE id = ?", (client_id,))
+        return cur.rowcount > 0
+
+    def add_columns(self, cols) -> int:
+        """Store every client of a core.bulk.ClientColumns, computing whatever it hasn't yet."""
+        cols.ensure_all()
+        rows = (
+            (cols.names[i], cols.dobs[i].isoformat(), cols.genders[i], None,
+             cols.mulank[i], cols.bhagyank[i], cols.name_total[i], cols.name_number[i], cols.angel[i],
+             cols.phase(i)["rating_clean"], cols.dobs[i].month, missing_mask(cols.frequency(i)))
+            for i in range(len(cols))
+        )
+        return self.insert_many(rows, expected=len(cols))
+
+    # ----------------------------------------------------
+    # Queries
+    # ----------------------------------------------------
+    @staticmethod
+    def _filter(mulank, bhagyank, name_number):
+        values = (mulank, bhagyank, name_number)
+        mask = tuple(v is not None for v in values)
+        return mask, [v for v in values if v is not None]
+
+    def find(self, mulank: int = None, bhagyank: int = None, name_number: int = None,
+             limit: int = 100, offset: int = 0) -> list:
+        """Rows matching every given number (None means "any"), in insertion order."""
+        mask, params = self._filter(mulank, bhagyank, name_number)
+        return self._conn.execute(FIND_SQL[mask], (*params, limit, offset)).fetchall()
+
+    def count(self, mulank: int = None, bhagyank: int = None, name_number: int = None) -> int:
+        mask, params = self._filter(mulank, bhagyank, name_number)
+        sql = PAIR_COUNT_SQL.get(mask) or COUNT_SQL[mask]
+        return self._conn.execute(sql, params).fetchone()[0]
+
+    def get(self, client_id: int):
+        return self._conn.execute(GET_SQL, (client_id,)).fetchone()
+
+    # ----------------------------------------------------
+    # Distributions — read from the aggregate tables only
+    # ----------------------------------------------------
+    def total(self) -> int:
+        return self._conn.execute("SELECT COALESCE(SUM(n), 0) FROM agg_months").fetchone()[0]
+
+    def pair_counts(self) -> dict:
+        """{(mulank, bhagyank): clients} for every pair that has any."""
+        rows = self._conn.execute("SELECT mulank, bhagyank, n FROM agg_pairs WHERE n > 0").fetchall()
+        return {(r["mulank"], r["bhagyank"]): r["n"] for r in rows}
+
+    def pair_count(self, mulank: int, bhagyank: int) -> int:
+        row = self._conn.execute(
+            "SELECT n FROM agg_pairs WHERE mulank = ? AND bhagyank = ?", (mulank, bhagyank)
+        ).fetchone()
+        return row["n"] if row else 0
+
+    def month_ratings(self) -> dict:
+        """{birth month: (clients, average 0-40 rating or None)}"""
+        rows = self._conn.execute("SELECT month, n, rating_n, rating_sum FROM agg_months WHERE n > 0").fetchall()
+        return {
+            r["month"]: (r["n"], r["rating_sum"] / r["rating_n"] if r["rating_n"] else None)
+            for r in rows
+        }
+
+    def missing_counts(self) -> dict:
+        """{digit 1..9: clients whose Lo Shu grid lacks it}"""
+        rows = self._conn.execute("SELECT digit, n FROM agg_missing ORDER BY digit").fetchall()
+        return {r["digit"]: r["n"] for r in rows}
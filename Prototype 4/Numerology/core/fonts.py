@@ -0,0 +1,134 @@
+# core/fonts.py
+"""
+Font manager for the PDF report.
+Provides:
+  - text_font(text): Helvetica when it can draw `text`, otherwise a registered
+    TrueType font that covers every character
+  - register_fonts(): registers available TrueType fonts once per process
+
+TrueType fonts are embedded by reportlab as subsets of the glyphs actually
+used. A subset holds ASCII plus the non-ASCII glyphs of that document, so
+it repeats only when the same text does (re-exports, a batch with one
+client's name on every page). Each font keeps the SUBSET_CACHE_SIZE most
+recently used subsets; anything older is rebuilt on demand.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+
+BUILTIN_FONT = "Helvetica"
+
+# (registered name, candidate files) — first existing file wins
+FONT_CANDIDATES = [
+    ("ReportSans", [
+        "assets/fonts/NotoSans-Regular.ttf",
+        "C:/Windows/Fonts/arial.ttf",
+        "/Library/Fonts/Arial Unicode.ttf",
+        "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+        "/usr/share/fonts/TTF/DejaVuSans.ttf",
+    ]),
+    ("ReportDevanagari", [
+        "assets/fonts/NotoSansDevanagari-Regular.ttf",
+        "C:/Windows/Fonts/Nirmala.ttf",
+        "C:/Windows/Fonts/mangal.ttf",
+        "/usr/share/fonts/truetype/noto/NotoSansDevanagari-Regular.ttf",
+        "/usr/share/fonts/truetype/lohit-devanagari/Lohit-Devanagari.ttf",
+    ]),
+]
+
+SUBSET_CACHE_SIZE = 16   # generated subsets kept per font
+
+_lock = threading.Lock()
+_registered = None   # list of (name, TTFont) once register_fonts() has run
+
+
+# ----------------------------------------------------
+# Subset caching
+# ----------------------------------------------------
+class _SubsetCachingTTFont(TTFont):
+    """TTFont that reuses a recently generated subset when the same glyphs come up again."""
+
+    def __init__(self, name, filename):
+        super().__init__(name, filename, asciiReadable=True)
+        make_subset = self.face.makeSubset
+        cache = OrderedDict()
+        cache_lock = threading.Lock()
+
+        def cached_make_subset(subset):
+            key = tuple(subset)
+            with cache_lock:
+                data = cache.get(key)
+                if data is not None:
+                    cache.move_to_end(key)
+                    return data
+            data = make_subset(subset)
+            with cache_lock:
+                cache[key] = data
+                while len(cache) > SUBSET_CACHE_SIZE:
+                    cache.popitem(last=False)
+            return data
+
+        self.face.makeSubset = cached_make_subset
+
+
+# ----------------------------------------------------
+# Registration
+# ----------------------------------------------------
+def register_fonts():
+    """Register every available candidate font. Safe to call repeatedly; the work happens once."""
+    global _registered
+    if _registered is not None:
+        return _registered
+
+    with _lock:
+        if _registered is None:
+            found = []
+            for name, paths in FONT_CANDIDATES:
+                for path in paths:
+                    if not os.path.exists(path):
+                        continue
+                    try:
+                        font = _SubsetCachingTTFont(name, path)
+                    except Exception as e:
+                        print("Font error:", path, e)
+                        continue
+                    pdfmetrics.registerFont(font)
+                    found.append((name, font))
+                    break
+            _registered = found
+    return _registered
+
+
+def _builtin_can_draw(text: str) -> bool:
+    try:
+        text.encode("cp1252")   # standard fonts use WinAnsiEncoding
+        return True
+    except UnicodeEncodeError:
+        return False
+
+
+@lru_cache(maxsize=4096)
+def text_font(text: str) -> str:
+    """Name of a font that can draw every character of `text`."""
+    if _builtin_can_draw(text):
+        return BUILTIN_FONT
+
+    fonts = register_fonts()
+    needed = {ord(ch) for ch in text if not ch.isspace()}
+    for name, font in fonts:
+        if needed.issubset(font.face.charToGlyph):
+            return name
+
+    # nothing covers everything; prefer the font covering the most
+    best = BUILTIN_FONT
+    best_count = 0
+    for name, font in fonts:
+        count = len(needed.intersection(font.face.charToGlyph))
+        if count > best_count:
+            best, best_count = name, count
+    return best
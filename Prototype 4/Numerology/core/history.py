@@ -0,0 +1,169 @@
+# core/history.py
+"""
+Local session history — every computed client, recallable without recomputing.
+Provides:
+  - HistoryStore(path): save(payload) / recent(limit) / search(prefix) / load(session_id)
+
+SQLite in WAL mode, so the GUI can read while a save is in flight. Sessions
+are unique per (name, dob, gender); saving the same client again refreshes
+the row. Rows are small and recalled by primary key, and recently loaded
+sessions are also kept in memory.
+"""
+
+import json
+import os
+import shutil
+import sqlite3
+import time
+from collections import OrderedDict
+from datetime import date
+
+from .util import app_data_dir
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id          INTEGER PRIMARY KEY,
+    name        TEXT NOT NULL,
+    name_key    TEXT NOT NULL,          -- casefolded, single-spaced name
+    dob         TEXT NOT NULL,          -- ISO yyyy-mm-dd
+    gender      TEXT NOT NULL,
+    results     TEXT NOT NULL,          -- JSON, as returned by calculate_all
+    phase_keys  TEXT NOT NULL,          -- JSON {"0-40": [driver, conductor], "40-80": [...]}
+    grid_image  TEXT,                   -- cached Lo Shu PNG
+    updated_at  REAL NOT NULL,
+    UNIQUE (name_key, dob, gender)
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_name ON sessions (name_key, dob);
+CREATE INDEX IF NOT EXISTS idx_sessions_dob ON sessions (dob);
+CREATE INDEX IF NOT EXISTS idx_sessions_updated ON sessions (updated_at);
+"""
+
+MEMORY_CACHE_SIZE = 256
+
+
+def name_key(name: str) -> str:
+    return " ".join(name.split()).casefold()
+
+
+class HistoryStore:
+    def __init__(self, path: str = None):
+        base = app_data_dir()
+        self.path = path or os.path.join(base, "history.db")
+        self.grid_dir = os.path.join(os.path.dirname(os.path.abspath(self.path)), "grids")
+        os.makedirs(self.grid_dir, exist_ok=True)
+
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._memory = OrderedDict()
+
+    def close(self):
+        self._conn.close()
+
+    # ----------------------------------------------------
+    # Save
+    # ----------------------------------------------------
+    def _keep_grid(self, src: str):
+        """Copy the grid PNG out of the temp folder; identical grids share one file."""
+        if not src or not os.path.exists(src):
+            return None
+        dst = os.path.join(self.grid_dir, os.path.basename(src))
+        if not os.path.exists(dst):
+            tmp = dst + ".tmp"
+            shutil.copyfile(src, tmp)
+            os.replace(tmp, dst)
+        return dst
+
+    def save(self, payload: dict) -> int:
+        """Store a report payload (as built by the UI) and return its session id."""
+        phases = payload["phases"]
+        phase_keys = {
+            ph: [phases[ph]["driver"], phases[ph]["conductor"]] for ph in ("0-40", "40-80")
+        }
+        params = (
+            payload["name"],
+            name_key(payload["name"]),
+            payload["dob"].isoformat(),
+            payload["gender"],
+            json.dumps(payload["results"]),
+            json.dumps(phase_keys),
+            self._keep_grid(payload.get("loshu_image")),
+            time.time(),
+        )
+        with self._conn:
+            self._conn.execute(
+                """
+                INSERT INTO sessions (name, name_key, dob, gender, results, phase_keys, grid_image, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (name_key, dob, gender) DO UPDATE SET
+                    name = excluded.name,
+                    results = excluded.results,
+                    phase_keys = excluded.phase_keys,
+                    grid_image = COALESCE(excluded.grid_image, sessions.grid_image),
+                    updated_at = excluded.updated_at
+                """,
+                params,
+            )
+            session_id = self._conn.execute(
+                "SELECT id FROM sessions WHERE name_key = ? AND dob = ? AND gender = ?",
+                (params[1], params[2], params[3]),
+            ).fetchone()[0]
+
+        self._memory.pop(session_id, None)
+        return session_id
+
+    # ----------------------------------------------------
+    # Lookup
+    # ----------------------------------------------------
+    def recent(self, limit: int = 50) -> list:
+        """[(id, name, dob)] most recently saved first."""
+        rows = self._conn.execute(
+            "SELECT id, name, dob FROM sessions ORDER BY updated_at DESC LIMIT ?", (limit,)
+        ).fetchall()
+        return [(r["id"], r["name"], date.fromisoformat(r["dob"])) for r in rows]
+
+    def search(self, prefix: str, limit: int = 50) -> list:
+        """[(id, name, dob)] whose name starts with `prefix` (case-insensitive), using the name index."""
+        key = name_key(prefix)
+        if not key:
+            return self.recent(limit)
+        rows = self._conn.execute(
+            "SELECT id, name, dob FROM sessions WHERE name_key >= ? AND name_key < ? "
+            "ORDER BY name_key, dob LIMIT ?",
+            (key, key + "\U0010ffff", limit),
+        ).fetchall()
+        return [(r["id"], r["name"], date.fromisoformat(r["dob"])) for r in rows]
+
+    def load(self, session_id: int):
+        """
+        Full session as a report payload, or None. Phases come from the
+        driver–conductor table by key; nothing is recalculated or rendered.
+        """
+        cached = self._memory.get(session_id)
+        if cached is not None:
+            self._memory.move_to_end(session_id)
+            return cached
+
+        row = self._conn.execute("SELECT * FROM sessions WHERE id = ?", (session_id,)).fetchone()
+        if row is None:
+            return None
+
+        from .driver_conductor import get_dc_analysis
+
+        phase_keys = json.loads(row["phase_keys"])
+        payload = {
+            "session_id": row["id"],
+            "name": row["name"],
+            "dob": date.fromisoformat(row["dob"]),
+            "gender": row["gender"],
+            "results": json.loads(row["results"]),
+            "loshu_image": row["grid_image"],
+            "phases": {ph: get_dc_analysis(*phase_keys[ph]) for ph in ("0-40", "40-80")},
+        }
+
+        self._memory[session_id] = payload
+        while len(self._memory) > MEMORY_CACHE_SIZE:
+            self._memory.popitem(last=False)
+        return payload
@@ -0,0 +1,80 @@
+# core/incremental.py
+"""
+Incremental numerology state for live (as-you-type) analysis.
+
+Only the parts that depend on a changed input are recomputed:
+  - name   -> Name Total / Name Number
+  - dob    -> Mulank, Bhagyank, Angel Number, phases, grid digits
+  - gender -> Angel Number, grid digits
+The grid is flagged for re-render only when the Lo Shu frequency vector changes.
+"""
+
+from .numerology_calculations import (
+    compute_mulank, compute_bhagyank, compute_name_number, compute_angel_number
+)
+from .loshu import loshu_digits, frequency_vector
+
+# Parts reported by IncrementalAnalysis.update()
+NAME = "name"
+NUMBERS = "numbers"
+PHASES = "phases"
+GRID = "grid"
+
+
+class IncrementalAnalysis:
+    def __init__(self):
+        self.name = None
+        self.dob = None
+        self.gender = None
+        self.results = {}
+        self.phases = None
+        self.digits = []
+        self.freq = None
+
+    def update(self, name, dob, gender) -> set:
+        """Bring the state up to date with the inputs and return the set of parts that changed."""
+        changed = set()
+
+        if name != self.name:
+            total, reduced = compute_name_number(name)
+            if (total, reduced) != (self.results.get("Name Total"), self.results.get("Name Number")):
+                self.results["Name Total"] = total
+                self.results["Name Number"] = reduced
+                changed.add(NAME)
+            self.name = name
+
+        dob_changed = dob != self.dob
+        if dob_changed:
+            pair = (compute_mulank(dob), compute_bhagyank(dob))
+            if pair != (self.results.get("Mulank"), self.results.get("Bhagyank")):
+                from .driver_conductor import get_phase_analysis   # 81-entry table, loaded on first DOB
+                self.results["Mulank"], self.results["Bhagyank"] = pair
+                self.phases = get_phase_analysis(*pair)
+                changed.update((NUMBERS, PHASES))
+            self.dob = dob
+
+        if dob_changed or gender != self.gender:
+            angel = compute_angel_number(dob, gender)
+            if angel != self.results.get("Angel Number"):
+                self.results["Angel Number"] = angel
+                changed.add(NUMBERS)
+            self.gender = gender
+
+            # the day itself feeds the grid, so any DOB change can move the digits
+            self.digits = loshu_digits(dob, self.results)
+            freq = frequency_vector(self.digits)
+            if freq != self.freq:
+                self.freq = freq
+                changed.add(GRID)
+
+        return changed
+
+    def results_in_order(self) -> dict:
+        """Results keyed and ordered like calculate_all()."""
+        return {
+            "Mulank": self.results["Mulank"],
+            "Bhagyank": self.results["Bhagyank"],
+            "Name Total": self.results["Name Total"],
+            "Name Number": self.results["Name Number"],
+            "Angel Number": self.results["Angel Number"],
+        }
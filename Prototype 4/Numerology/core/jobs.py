@@ -0,0 +1,331 @@
+# core/jobs.py
+"""
+Resumable bulk PDF runs: one report per client of a CSV.
+Provides:
+  - run_bulk_reports(csv_path, out_dir, ...) -> summary dict
+  - JobJournal(path): per-record status kept in SQLite next to the outputs
+
+Every record's outcome is committed to the journal as soon as it is known,
+and each PDF is written to a temp file and moved into place, so a killed
+run leaves only finished outputs behind. Running the same command again
+skips records whose output is still what the journal recorded (size and
+mtime; sha256 too with verify_hash=True), retries failures up to
+max_attempts, and renders the rest. Records are keyed by their line in the
+CSV, so fixing a skipped row renders just that row.
+
+Run from the app folder:
+    python -m core.jobs clients.csv reports/ --profile screen --workers 4
+"""
+
+import hashlib
+import os
+import re
+import sqlite3
+import tempfile
+import time
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+from .bulk import read_clients_csv
+from .pdf_report import DEFAULT_PROFILE, TEMPLATE_VERSION
+
+JOURNAL_NAME = ".journal.db"
+JOURNAL_VERSION = 1   # 0: records keyed by position after skipped rows
+MAX_ATTEMPTS = 3
+
+PENDING = "pending"
+DONE = "done"
+FAILED = "failed"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    line        INTEGER PRIMARY KEY,    -- line number of the record in the CSV
+    key         TEXT NOT NULL,          -- hash of inputs + profile + template version
+    output      TEXT NOT NULL,          -- file name inside the output folder
+    status      TEXT NOT NULL,
+    attempts    INTEGER NOT NULL DEFAULT 0,   -- failures since the last success
+    sha256      TEXT,
+    size        INTEGER,
+    mtime_ns    INTEGER,
+    error       TEXT,
+    updated_at  REAL
+);
+CREATE INDEX IF NOT EXISTS idx_records_status ON records (status);
+"""
+
+
+def record_key(name: str, dob, gender: str, profile: str) -> str:
+    # name and gender as the report prints them: "male" and "Male" are different PDFs
+    blob = f"{TEMPLATE_VERSION}|{profile}|{name}|{dob.isoformat()}|{gender}"
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def output_name(line: int, name: str) -> str:
+    # letters, marks and digits of any script survive ("रवि" keeps its vowel sign)
+    safe = "".join(ch if ch in "-_" or unicodedata.category(ch)[0] in "LMN" else "_" for ch in name)
+    safe = re.sub(r"_+", "_", safe).strip("_")[:40] or "client"
+    return f"{line:06d}_{safe}.pdf"
+
+
+def _file_sha256(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for block in iter(lambda: fh.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+# ----------------------------------------------------
+# Journal
+# ----------------------------------------------------
+class JobJournal:
+    def __init__(self, path: str):
+        self.path = path
+        self._conn = sqlite3.connect(path)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        if self._conn.execute("PRAGMA user_version").fetchone()[0] < JOURNAL_VERSION:
+            # positional keys can't be mapped to CSV lines; those records render once more
+            self._conn.executescript(f"DROP TABLE IF EXISTS records; PRAGMA user_version = {JOURNAL_VERSION};")
+        self._conn.executescript(SCHEMA)
+
+    def close(self):
+        self._conn.close()
+
+    def sync(self, records):
+        """
+        Make the journal match `records` [(line, key, output)]. Unknown lines are
+        added as pending; lines whose inputs changed since the last run are reset.
+        """
+        known = {r["line"]: r["key"] for r in self._conn.execute("SELECT line, key FROM records")}
+        fresh = []
+        for line, key, output in records:
+            old = known.pop(line, None)
+            if old != key:
+                fresh.append((line, key, output, PENDING, time.time()))
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO records (line, key, output, status, updated_at) VALUES (?, ?, ?, ?, ?)",
+                fresh,
+            )
+            if known:   # lines now gone from the CSV, or now skipped
+                self._conn.executemany("DELETE FROM records WHERE line = ?", [(i,) for i in known])
+
+    def rows(self, status=None):
+        if status is None:
+            return self._conn.execute("SELECT * FROM records ORDER BY line").fetchall()
+        return self._conn.execute("SELECT * FROM records WHERE status = ? ORDER BY line", (status,)).fetchall()
+
+    def mark_done(self, line: int, sha256: str, size: int, mtime_ns: int):
+        # attempts counts failures since the last success, so a record re-rendered
+        # after its output went missing gets the full max_attempts again
+        with self._conn:
+            self._conn.execute(
+                "UPDATE records SET status = ?, attempts = 0, sha256 = ?, size = ?, mtime_ns = ?, "
+                "error = NULL, updated_at = ? WHERE line = ?",
+                (DONE, sha256, size, mtime_ns, time.time(), line),
+            )
+
+    def mark_failed(self, line: int, error: str) -> int:
+        """Record a failed attempt and return the attempt count so far."""
+        with self._conn:
+            self._conn.execute(
+                "UPDATE records SET status = ?, attempts = attempts + 1, error = ?, updated_at = ? WHERE line = ?",
+                (FAILED, error[:500], time.time(), line),
+            )
+        return self._conn.execute("SELECT attempts FROM records WHERE line = ?", (line,)).fetchone()[0]
+
+    def reset(self, line: int):
+        with self._conn:
+            self._conn.execute(
+                "UPDATE records SET status = ?, attempts = 0, error = NULL WHERE line = ?", (PENDING, line)
+            )
+
+    def counts(self) -> dict:
+        rows = self._conn.execute("SELECT status, COUNT(*) FROM records GROUP BY status").fetchall()
+        return {status: n for status, n in rows}
+
+
+# ----------------------------------------------------
+# One record (runs in a worker process when workers > 1)
+# ----------------------------------------------------
+def render_record(name, dob, gender, profile, grid_dir, out_path) -> tuple:
+    """Render one report to `out_path` atomically. Returns (sha256, size, mtime_ns)."""
+    import io
+    from .pdf_report import create_pdf_report
+    from .reports import build_payload
+
+    buf = io.BytesIO()
+    create_pdf_report(buf, build_payload(name, dob, gender, grid_dir), profile=profile)
+    data = buf.getvalue()
+
+    directory = os.path.dirname(out_path)
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(data)
+        os.replace(tmp, out_path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except FileNotFoundError:
+            pass
+        raise
+
+    st = os.stat(out_path)
+    return hashlib.sha256(data).hexdigest(), st.st_size, st.st_mtime_ns
+
+
+# ----------------------------------------------------
+# Runner
+# ----------------------------------------------------
+def _still_valid(out_dir: str, row, verify_hash: bool) -> bool:
+    path = os.path.join(out_dir, row["output"])
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return False
+    if st.st_size != row["size"] or st.st_mtime_ns != row["mtime_ns"]:
+        return False
+    return not verify_hash or _file_sha256(path) == row["sha256"]
+
+
+def run_bulk_reports(csv_path: str, out_dir: str, profile: str = DEFAULT_PROFILE, workers: int = 1,
+                     max_attempts: int = MAX_ATTEMPTS, verify_hash: bool = False,
+                     retry_failed: bool = False, progress=None) -> dict:
+    """
+    Render a report for every client in `csv_path` into `out_dir`, resuming
+    any earlier run into the same folder. `progress(finished, total)` is
+    called after each record. Returns counts of what happened.
+    """
+    start = time.perf_counter()
+    os.makedirs(out_dir, exist_ok=True)
+    grid_dir = os.path.join(out_dir, "grids")
+
+    cols = read_clients_csv(csv_path)
+    # keyed by CSV line, so fixing a skipped row doesn't re-key every record after it
+    inputs = dict(zip(cols.lines, zip(cols.names, cols.dobs, cols.genders)))
+
+    journal = JobJournal(os.path.join(out_dir, JOURNAL_NAME))
+    try:
+        journal.sync(
+            (line, record_key(name, dob, gender, profile), output_name(line, name))
+            for line, (name, dob, gender) in inputs.items()
+        )
+
+        summary = {"total": len(inputs), "skipped": 0, "rendered": 0, "failed": 0, "gave_up": 0}
+        todo = []
+        for row in journal.rows():
+            if row["status"] == DONE and _still_valid(out_dir, row, verify_hash):
+                summary["skipped"] += 1
+                continue
+            if row["status"] == FAILED and row["attempts"] >= max_attempts:
+                if not retry_failed:
+                    summary["gave_up"] += 1
+                    continue
+                journal.reset(row["line"])
+            todo.append((row["line"], row["output"]))
+
+        finished = summary["skipped"] + summary["gave_up"]
+        if progress:
+            progress(finished, len(inputs))
+
+        def job_args(line, output):
+            name, dob, gender = inputs[line]
+            return (name, dob, gender, profile, grid_dir, os.path.join(out_dir, output))
+
+        def settle(line, output, outcome, error):
+            """Journal one attempt; returns True when the record needs another try."""
+            nonlocal finished
+            if error is None:
+                journal.mark_done(line, *outcome)
+                summary["rendered"] += 1
+            else:
+                print("Report failed:", output, error)
+                if journal.mark_failed(line, error) < max_attempts:
+                    return True
+                summary["failed"] += 1
+            finished += 1
+            if progress:
+                progress(finished, len(inputs))
+            return False
+
+        if workers <= 1:
+            for line, output in todo:
+                while True:
+                    try:
+                        outcome, error = render_record(*job_args(line, output)), None
+                    except Exception as e:
+                        outcome, error = None, f"{type(e).__name__}: {e}"
+                    if not settle(line, output, outcome, error):
+                        break
+        else:
+            _run_pool(todo, workers, job_args, settle)
+    finally:
+        journal.close()
+
+    summary["seconds"] = time.perf_counter() - start
+    return summary
+
+
+def _run_pool(todo, workers, job_args, settle):
+    """Keep at most 2 × workers records in flight; failed ones go back in the queue."""
+    queue = list(reversed(todo))
+    running = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        while queue or running:
+            while queue and len(running) < workers * 2:
+                line, output = queue.pop()
+                running[pool.submit(render_record, *job_args(line, output))] = (line, output)
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for fut in done:
+                line, output = running.pop(fut)
+                try:
+                    outcome, error = fut.result(), None
+                except Exception as e:
+                    outcome, error = None, f"{type(e).__name__}: {e}"
+                if settle(line, output, outcome, error):
+                    queue.append((line, output))
+
+
+# =====================================================================
+# CLI
+# =====================================================================
+def main():
+    import argparse
+
+    from .pdf_report import PDF_PROFILES
+
+    parser = argparse.ArgumentParser(description="Render one PDF report per client, resumably")
+    parser.add_argument("csv", help="CSV with name, dob and optional gender columns")
+    parser.add_argument("out_dir")
+    parser.add_argument("--profile", default=DEFAULT_PROFILE, choices=list(PDF_PROFILES))
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--max-attempts", type=int, default=MAX_ATTEMPTS)
+    parser.add_argument("--verify-hash", action="store_true", help="re-hash finished outputs before skipping them")
+    parser.add_argument("--retry-failed", action="store_true", help="try records that used up their attempts again")
+    parser.add_argument("--memprof", metavar="LOG",
+                        help="profile memory per render stage; workers append JSON lines to LOG")
+    args = parser.parse_args()
+
+    if args.memprof:
+        # set before the pool starts so every worker process inherits it
+        os.environ["NUMEROLOGY_MEMPROF"] = "1"
+        os.environ["NUMEROLOGY_MEMPROF_LOG"] = os.path.abspath(args.memprof)
+        from . import memprof
+        memprof.enable(log_path=os.environ["NUMEROLOGY_MEMPROF_LOG"])
+
+    def show(finished, total):
+        if finished == total or finished % 100 == 0:
+            print(f"\r{finished:,}/{total:,}", end="", flush=True)
+
+    summary = run_bulk_reports(args.csv, args.out_dir, args.profile, args.workers, args.max_attempts,
+                               args.verify_hash, args.retry_failed, progress=show)
+    print()
+    print(", ".join(f"{k}: {v:.1f}" if isinstance(v, float) else f"{k}: {v}" for k, v in summary.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,54 @@
-from PIL import Image, ImageDraw, ImageFont, ImageFilter
+# PIL is imported inside the render functions so the digit helpers (and the
+# rest of core) load without it
 from collections import Counter
 
+from .metrics import timed
+from .memprof import profiled
+
 LOSHU_LAYOUT = [
     [4, 9, 2],
     [3, 5, 7],
     [8, 1, 6]
 ]
 
+# -----------------------------------------
+# DIGITS THAT FEED THE GRID
+# -----------------------------------------
+def loshu_digits(dob, results):
+    """Digits of the DOB plus Mulank (when it differs from the day), Bhagyank and Angel Number."""
+    digits = []
+    digits.extend(int(d) for d in str(dob.day))
+    digits.extend(int(d) for d in str(dob.month))
+    digits.extend(int(d) for d in str(dob.year))
+
+    mulank = results["Mulank"]
+    if mulank != dob.day:
+        digits.extend(int(d) for d in str(mulank))
+
+    digits.extend(int(d) for d in str(results["Bhagyank"]))
+    digits.extend(int(d) for d in str(results["Angel Number"]))
+    return digits
+
+
+def frequency_vector(digits):
+    """Counts of 1..9 — two digit lists with the same vector render the same grid."""
+    freq = Counter(digits)
+    return tuple(freq.get(n, 0) for n in range(1, 10))
+
+
+def missing_mask(freq) -> int:
+    """Bit n-1 set for every number n (1..9) absent from the grid of frequency vector `freq`."""
+    mask = 0
+    for n, count in enumerate(freq):
+        if not count:
+            mask |= 1 << n
+    return mask
+
 # -----------------------------------------
 # LOAD NORMAL / BOLD FONTS
 # -----------------------------------------
 def _load_font(size=48, bold=False):
+    from PIL import ImageFont
     try:
         return ImageFont.truetype("arialbd.ttf" if bold else "arial.ttf", size)
     except:
@@ -27,6 +65,8 @@ def _get_text_size(draw, text, font):
 # -----------------------------------------
 # RENDER LOSHU GRID WITH GLOW EFFECT
 # -----------------------------------------
+@timed("loshu_render")
+@profiled("loshu_render")
 def render_loshu_grid(digits, size=520, background_path="assets/bg.png"):
     """
     - Smaller grid
@@ -35,6 +75,8 @@ def render_loshu_grid(digits, size=520, background_path="assets/bg.png"):
     - Aqua-green glow for center digits
     - Thin borders
     """
+    from PIL import Image, ImageDraw, ImageFilter
+
     freq = Counter(digits)
 
     # Load background
@@ -126,3 +168,65 @@ def render_loshu_grid(digits, size=520, background_path="assets/bg.png"):
     )
 
     return Image.alpha_composite(bg, img)
+
+
+# -----------------------------------------
+# RENDER LOSHU GRID AS SVG (no PIL)
+# -----------------------------------------
+@timed("loshu_svg")
+def render_loshu_svg(digits, size=520):
+    """
+    Vector version of render_loshu_grid: same layout, colours and glows,
+    drawn by the viewer. Cheap enough to build on the request thread.
+    """
+    from xml.sax.saxutils import escape
+
+    freq = Counter(digits)
+    margin = int(size * 0.12)
+    grid_size = size - margin * 2
+    cell = grid_size // 3
+    corner_size = max(24, cell // 8)
+    center_size = max(42, cell // 3)
+
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{size}" height="{size}" viewBox="0 0 {size} {size}">',
+        '<defs>'
+        '<filter id="gold" x="-50%" y="-50%" width="200%" height="200%">'
+        '<feGaussianBlur stdDeviation="4" result="b"/><feMerge><feMergeNode in="b"/><feMergeNode in="SourceGraphic"/></feMerge>'
+        '</filter>'
+        '<filter id="aqua" x="-50%" y="-50%" width="200%" height="200%">'
+        '<feGaussianBlur stdDeviation="8" result="b"/><feMerge><feMergeNode in="b"/><feMergeNode in="SourceGraphic"/></feMerge>'
+        '</filter>'
+        '</defs>',
+        f'<rect width="{size}" height="{size}" fill="rgb(20,20,20)"/>',
+        '<g font-family="Arial, Helvetica, sans-serif" font-weight="bold">',
+    ]
+
+    for r in range(3):
+        for c in range(3):
+            x1 = margin + c * cell
+            y1 = margin + r * cell
+            num = LOSHU_LAYOUT[r][c]
+            count = freq.get(num, 0)
+            display_text = escape(str(num) * count if count else "0")
+
+            parts.append(
+                f'<rect x="{x1}" y="{y1}" width="{cell}" height="{cell}" rx="20" '
+                f'fill="white" fill-opacity="0.12" stroke="white" stroke-width="2"/>'
+            )
+            parts.append(
+                f'<text x="{x1 + 8}" y="{y1 + 5}" dominant-baseline="hanging" font-size="{corner_size}" '
+                f'fill="rgb(255,215,0)" filter="url(#gold)">{num}</text>'
+            )
+            parts.append(
+                f'<text x="{x1 + cell / 2:g}" y="{y1 + cell / 2:g}" text-anchor="middle" dominant-baseline="central" '
+                f'font-size="{center_size}" fill="rgb(46,220,200)" filter="url(#aqua)">{display_text}</text>'
+            )
+
+    parts.append('</g>')
+    parts.append(
+        f'<rect x="{margin}" y="{margin}" width="{grid_size}" height="{grid_size}" rx="25" '
+        f'fill="none" stroke="white" stroke-width="3"/>'
+    )
+    parts.append('</svg>')
+    return "\n".join(parts)
@@ -0,0 +1,262 @@
+# core/memprof.py
+"""
+Opt-in memory diagnostics for the heavy stages (grid rendering, PDF generation).
+Provides:
+  - stage(name) / @profiled(name): measure one stage
+  - enable(top, log_path) / disable() / enabled()
+  - records(): what has been measured; summary(): per-stage totals
+  - format_record(rec) / format_summary(): plain-text output
+
+Enable with NUMEROLOGY_MEMPROF=1 (summary printed at exit) or enable().
+NUMEROLOGY_MEMPROF_LOG=<path> also appends one JSON line per stage, with
+the pid, which is how worker processes (bulk runs, the HTTP service) report.
+
+For each stage it records:
+  peak        — highest traced Python allocation above the level at entry
+  net         — traced memory still held when the stage returned
+  rss_before / rss_after — resident set size (Linux /proc; None elsewhere)
+  max_rss     — the process's peak RSS so far (getrusage)
+  top         — largest allocation differences by source line
+
+tracemalloc sees Python allocations only. Pillow keeps pixel data in its
+own native buffers, so most of a grid render's memory shows up in the RSS
+columns rather than in peak/net.
+
+tracemalloc makes every allocation slower and snapshots are not cheap, so
+this is for diagnosis runs only; disabled, the hooks cost one flag check.
+Allocation tracking is process-wide: stages running at the same time in
+other threads show up in each other's numbers.
+"""
+
+import atexit
+import os
+import sys
+import threading
+import time
+from collections import deque
+from functools import wraps
+
+# tracemalloc and json are imported on first use: core imports this module
+# on every start, profiling or not
+
+TOP = 10
+MAX_RECORDS = 1000
+
+_enabled = False
+_top = TOP
+_log_path = None
+_records = deque(maxlen=MAX_RECORDS)
+_stack = []          # open stages, innermost last
+_lock = threading.Lock()
+
+
+# ----------------------------------------------------
+# Process memory
+# ----------------------------------------------------
+def rss_bytes():
+    """Current resident set size, or None where it can't be read cheaply."""
+    try:
+        with open("/proc/self/statm") as fh:
+            return int(fh.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def max_rss_bytes():
+    try:
+        import resource
+    except ImportError:   # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+# ----------------------------------------------------
+# Switch
+# ----------------------------------------------------
+def enable(top: int = TOP, log_path: str = None, frames: int = 1):
+    global _enabled, _top, _log_path
+    import tracemalloc
+
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(frames)
+    _top = top
+    _log_path = log_path
+    _enabled = True
+
+
+def disable():
+    global _enabled
+    import tracemalloc
+
+    _enabled = False
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+# ----------------------------------------------------
+# Stages
+# ----------------------------------------------------
+class _Frame:
+    __slots__ = ("name", "start", "base", "peak", "snapshot", "rss_before")
+
+
+def _fold_peak():
+    """Carry the current traced peak into every open stage before it is reset."""
+    import tracemalloc
+
+    _, peak = tracemalloc.get_traced_memory()
+    for frame in _stack:
+        if peak > frame.peak:
+            frame.peak = peak
+
+
+class _Stage:
+    __slots__ = ("name", "frame")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        import tracemalloc
+
+        frame = self.frame = _Frame()
+        frame.name = self.name
+        with _lock:
+            _fold_peak()
+            frame.snapshot = tracemalloc.take_snapshot()
+            frame.rss_before = rss_bytes()
+            tracemalloc.reset_peak()
+            frame.base, frame.peak = tracemalloc.get_traced_memory()
+            frame.start = time.perf_counter()
+            _stack.append(frame)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        import tracemalloc
+
+        frame = self.frame
+        with _lock:
+            seconds = time.perf_counter() - frame.start
+            _fold_peak()
+            current, _ = tracemalloc.get_traced_memory()
+            after = tracemalloc.take_snapshot()
+            if frame in _stack:
+                _stack.remove(frame)
+
+        diffs = after.compare_to(frame.snapshot, "lineno")[:_top]
+        record = {
+            "stage": frame.name,
+            "pid": os.getpid(),
+            "seconds": seconds,
+            "peak": frame.peak - frame.base,
+            "net": current - frame.base,
+            "rss_before": frame.rss_before,
+            "rss_after": rss_bytes(),
+            "max_rss": max_rss_bytes(),
+            "failed": exc_type is not None,
+            "top": [
+                {"where": str(d.traceback[0]), "size_diff": d.size_diff, "count_diff": d.count_diff}
+                for d in diffs if d.size_diff
+            ],
+        }
+        _records.append(record)
+        if _log_path:
+            import json
+
+            with open(_log_path, "a", encoding="utf-8") as fh:
+                fh.write(json.dumps(record) + "\n")
+        return False
+
+
+class _NoStage:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NO_STAGE = _NoStage()
+
+
+def stage(name: str):
+    return _Stage(name) if _enabled else _NO_STAGE
+
+
+def profiled(name: str):
+    def wrap(fn):
+        @wraps(fn)
+        def inner(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            with _Stage(name):
+                return fn(*args, **kwargs)
+        return inner
+    return wrap
+
+
+# ----------------------------------------------------
+# Output
+# ----------------------------------------------------
+def records() -> list:
+    return list(_records)
+
+
+def summary() -> dict:
+    """{stage: {"calls", "max_peak", "mean_net", "rss_growth"}} over the kept records."""
+    out = {}
+    for rec in _records:
+        s = out.setdefault(rec["stage"], {"calls": 0, "max_peak": 0, "total_net": 0,
+                                          "first_rss": rec["rss_before"], "last_rss": rec["rss_after"]})
+        s["calls"] += 1
+        s["max_peak"] = max(s["max_peak"], rec["peak"])
+        s["total_net"] += rec["net"]
+        s["last_rss"] = rec["rss_after"]
+    for s in out.values():
+        s["mean_net"] = s.pop("total_net") / s["calls"]
+        first, last = s.pop("first_rss"), s.pop("last_rss")
+        s["rss_growth"] = last - first if first is not None and last is not None else None
+    return out
+
+
+def _mb(n):
+    return "n/a" if n is None else f"{n / (1024 * 1024):.1f} MB"
+
+
+def format_record(rec: dict) -> str:
+    lines = [
+        f"[{rec['stage']}] {rec['seconds'] * 1000:.1f} ms  peak {_mb(rec['peak'])}  net {_mb(rec['net'])}  "
+        f"rss {_mb(rec['rss_before'])} -> {_mb(rec['rss_after'])}  max rss {_mb(rec['max_rss'])}"
+    ]
+    for d in rec["top"]:
+        lines.append(f"    {d['size_diff'] / 1024:+10.1f} KiB  {d['count_diff']:+6d} blocks  {d['where']}")
+    return "\n".join(lines)
+
+
+def format_summary() -> str:
+    lines = ["memory by stage:"]
+    for name, s in sorted(summary().items()):
+        growth = "n/a" if s["rss_growth"] is None else f"{s['rss_growth'] / (1024 * 1024):+.1f} MB"
+        lines.append(f"  {name:<16} calls {s['calls']:<6} max peak {_mb(s['max_peak']):>10}  "
+                     f"mean net {_mb(s['mean_net']):>10}  rss growth {growth}")
+    if _records:
+        lines.append("largest single peak:")
+        lines.append(format_record(max(_records, key=lambda r: r["peak"])))
+    return "\n".join(lines)
+
+
+def _print_summary():
+    if _records:
+        print(format_summary(), file=sys.stderr)
+
+
+if os.environ.get("NUMEROLOGY_MEMPROF", "") not in ("", "0"):
+    enable(log_path=os.environ.get("NUMEROLOGY_MEMPROF_LOG") or None)
+    atexit.register(_print_summary)
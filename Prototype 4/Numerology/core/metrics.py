@@ -0,0 +1,130 @@
+# core/metrics.py
+"""
+Process-wide metrics: counters, latency histograms and per-stage timing spans.
+Provides:
+  - span(stage): context manager timing one stage of the pipeline
+  - timed(stage): decorator form of span()
+  - observe(stage, seconds): record a duration measured elsewhere (e.g. across threads)
+  - inc(name, value, **labels): bump a counter
+  - REGISTRY.to_prometheus() / REGISTRY.to_json() (REGISTRY is also registry())
+  - enable() / disable() / enabled()
+
+Off unless NUMEROLOGY_METRICS=1 is set or enable() is called. While off,
+span() hands back one shared do-nothing context manager and the other hooks
+return after a single flag check, so instrumented code pays well under a
+microsecond per call. The registry itself (core/metrics_registry.py, which
+brings in threading) is only imported on enable() or the first metric
+recorded, so it costs nothing at startup.
+
+Stage timings all go into one histogram family, `numerology_stage_seconds`,
+labelled by stage; failed stages are counted in `numerology_stage_errors_total`.
+"""
+
+import os
+import time
+from _thread import allocate_lock   # `threading` loads with the registry, not with core
+
+_enabled = os.environ.get("NUMEROLOGY_METRICS", "") not in ("", "0")
+_registry = None
+_registry_lock = allocate_lock()
+
+
+def registry():
+    """The process-wide Registry (core/metrics_registry.py), built on first use."""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                from .metrics_registry import Registry
+                _registry = Registry()
+    return _registry
+
+
+def __getattr__(name):
+    # REGISTRY is looked up as a module attribute so it can be built lazily
+    if name == "REGISTRY":
+        return registry()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def enable(on: bool = True):
+    global _enabled
+    if on:
+        registry()
+    _enabled = on
+
+
+def disable():
+    enable(False)
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+# ----------------------------------------------------
+# Hooks
+# ----------------------------------------------------
+STAGE_SECONDS = "stage_seconds"
+STAGE_ERRORS = "stage_errors_total"
+
+
+class _NoSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NO_SPAN = _NoSpan()
+
+
+class _Span:
+    __slots__ = ("stage", "start")
+
+    def __init__(self, stage):
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed = time.perf_counter() - self.start
+        registry().histogram(STAGE_SECONDS, "Time spent per pipeline stage", stage=self.stage).observe(elapsed)
+        if exc_type is not None:
+            registry().counter(STAGE_ERRORS, "Pipeline stages that raised", stage=self.stage).inc()
+        return False
+
+
+def span(stage: str):
+    return _Span(stage) if _enabled else _NO_SPAN
+
+
+def timed(stage: str):
+    def wrap(fn):
+        def inner(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            with _Span(stage):
+                return fn(*args, **kwargs)
+        # functools.wraps by hand: functools is not otherwise loaded by `import core`
+        for attr in ("__module__", "__name__", "__qualname__", "__doc__"):
+            setattr(inner, attr, getattr(fn, attr))
+        inner.__dict__.update(fn.__dict__)
+        inner.__wrapped__ = fn
+        return inner
+    return wrap
+
+
+def observe(stage: str, seconds: float):
+    if _enabled:
+        registry().histogram(STAGE_SECONDS, "Time spent per pipeline stage", stage=stage).observe(seconds)
+
+
+def inc(name: str, value=1, **labels):
+    if _enabled:
+        registry().counter(name, **labels).inc(value)
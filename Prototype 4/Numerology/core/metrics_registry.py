@@ -0,0 +1,135 @@
+# core/metrics_registry.py
+"""
+Metric types behind core/metrics.py, kept apart so that `import core` does
+not load threading; core.metrics imports this on enable() or on the first
+metric recorded.
+Provides:
+  - Counter, Histogram
+  - Registry: .counter() / .histogram() / .to_prometheus() / .to_json()
+"""
+
+import threading
+from bisect import bisect_left
+
+PREFIX = "numerology_"
+
+# seconds — from a single calculate_all() up to a slow batch PDF
+DEFAULT_BUCKETS = (0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.025,
+                   0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Counter:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.value = 0
+
+    def inc(self, value=1):
+        with self._lock:
+            self.value += value
+
+    def snapshot(self):
+        return self.value
+
+
+class Histogram:
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self.counts = [0] * (len(self.buckets) + 1)   # last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        i = bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[i] += 1
+            self.count += 1
+            self.sum += value
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            cumulative, running = [], 0
+            for c in self.counts:
+                running += c
+                cumulative.append(running)
+            return {
+                "count": self.count,
+                "sum": self.sum,
+                "buckets": dict(zip([*map(str, self.buckets), "+Inf"], cumulative)),
+            }
+
+
+class Registry:
+    """Metric families by name; each family holds one metric per label set."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._families = {}   # name -> (kind, help, {labels tuple: metric})
+
+    def _get(self, kind, name, help_text, labels, factory):
+        key = tuple(sorted(labels.items()))
+        family = self._families.get(name)
+        if family is None:
+            with self._lock:
+                family = self._families.setdefault(name, (kind, help_text, {}))
+        children = family[2]
+        metric = children.get(key)
+        if metric is None:
+            with self._lock:
+                metric = children.setdefault(key, factory())
+        return metric
+
+    def counter(self, name, help_text="", **labels) -> Counter:
+        return self._get("counter", name, help_text, labels, Counter)
+
+    def histogram(self, name, help_text="", buckets=DEFAULT_BUCKETS, **labels) -> Histogram:
+        return self._get("histogram", name, help_text, labels, lambda: Histogram(buckets))
+
+    def reset(self):
+        with self._lock:
+            self._families.clear()
+
+    # ------------------------------------------------
+    # Export
+    # ------------------------------------------------
+    def to_json(self) -> dict:
+        out = {}
+        for name, (kind, help_text, children) in sorted(self._families.items()):
+            out[name] = {
+                "type": kind,
+                "help": help_text,
+                "values": [
+                    {"labels": dict(labels), "value": metric.snapshot()}
+                    for labels, metric in sorted(children.items())
+                ],
+            }
+        return out
+
+    def to_prometheus(self) -> str:
+        """Prometheus text exposition format 0.0.4."""
+        lines = []
+        for name, (kind, help_text, children) in sorted(self._families.items()):
+            full = PREFIX + name
+            if help_text:
+                lines.append(f"# HELP {full} {help_text}")
+            lines.append(f"# TYPE {full} {kind}")
+            for labels, metric in sorted(children.items()):
+                if kind == "counter":
+                    lines.append(f"{full}{_labels(labels)} {metric.snapshot()}")
+                    continue
+                snap = metric.snapshot()
+                for le, n in snap["buckets"].items():
+                    lines.append(f"{full}_bucket{_labels(labels + (('le', le),))} {n}")
+                lines.append(f"{full}_sum{_labels(labels)} {snap['sum']!r}")
+                lines.append(f"{full}_count{_labels(labels)} {snap['count']}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(pairs) -> str:
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
@@ -0,0 +1,121 @@
+# core/name_analysis.py
+"""
+Expression, Soul Urge and Personality numbers of a name.
+Provides:
+  - analyze_name(name, system, breakdown) -> dict
+  - analyze_names_batch(names, system) -> {column: array}
+  - VOWELS
+
+Expression counts every letter (the same total as the Name Number), Soul
+Urge the vowels A E I O U, Personality the consonants; Y counts as a
+consonant. All three reduce to 1-9 by the same rule as the Name Number;
+when a reduction passes through 11, 22 or 33, that master number is given
+alongside ("Expression Master" etc., else None).
+
+Per system, a vowel-value table is compiled next to the system's letter
+table (core/systems.py). A Latin-1 name is encoded once and summed with
+bytes.translate() against both tables; Personality is the difference, so
+consonants need no pass of their own.
+"""
+
+from .systems import DEFAULT_SYSTEM, get_system
+
+VOWELS = frozenset("AEIOU")
+
+_compiled = {}   # system -> (vowel table, per-code-point letter entries)
+
+
+def _tables(system):
+    tables = _compiled.get(system)
+    if tables is None:
+        values = system.values
+        vowel_table = bytearray(256)
+        entries = []
+        for cp in range(256):
+            letters = tuple((u, values[u], u in VOWELS) for u in chr(cp).upper() if values.get(u))
+            vowel_table[cp] = sum(v for _, v, vowel in letters if vowel)
+            entries.append(letters)
+        tables = _compiled[system] = (bytes(vowel_table), entries)
+    return tables
+
+
+def _wide_scan(name: str, system, want_letters: bool):
+    """Totals (and letters) for names outside Latin-1, one character at a time."""
+    values = system.values
+    total = soul = 0
+    letters = []
+    for u in name.upper():
+        v = values.get(u)
+        if not v:
+            continue
+        total += v
+        vowel = u in VOWELS
+        if vowel:
+            soul += v
+        if want_letters:
+            letters.append((u, v, vowel))
+    return total, soul, letters
+
+
+def analyze_name(name: str, system=DEFAULT_SYSTEM, breakdown: bool = False) -> dict:
+    """
+    The three name numbers with their totals. With breakdown=True,
+    "Letters" lists (letter, value, is_vowel) in name order for the report.
+    """
+    system = get_system(system)
+    vowel_table, entries = _tables(system)
+    try:
+        raw = name.encode("latin-1")
+    except UnicodeEncodeError:
+        total, soul, letters = _wide_scan(name, system, breakdown)
+    else:
+        total = sum(raw.translate(system.table))
+        soul = sum(raw.translate(vowel_table))
+        letters = [entry for cp in raw for entry in entries[cp]] if breakdown else None
+
+    out = {"System": system.name}
+    for label, value in (("Expression", total), ("Soul Urge", soul), ("Personality", total - soul)):
+        master = system.reduce(value, keep_masters=True)
+        out[label] = system.reduce(value, keep_masters=False)
+        out[label + " Total"] = value
+        out[label + " Master"] = master if master > 9 else None
+    if breakdown:
+        out["Letters"] = letters
+    return out
+
+
+def analyze_names_batch(names, system=DEFAULT_SYSTEM) -> dict:
+    """
+    analyze_name() for a whole client list, as columns: {"Expression":
+    array('b'), "Expression Total": array('l'), ...} in input order
+    (the master-number keys are left out).
+    """
+    from array import array
+
+    system = get_system(system)
+    vowel_table, _ = _tables(system)
+    table, reduce = system.table, system.reduce
+
+    cols = {}
+    for key in ("Expression", "Soul Urge", "Personality"):
+        cols[key] = array("b")
+        cols[key + " Total"] = array("l")
+    add_e, add_et = cols["Expression"].append, cols["Expression Total"].append
+    add_s, add_st = cols["Soul Urge"].append, cols["Soul Urge Total"].append
+    add_p, add_pt = cols["Personality"].append, cols["Personality Total"].append
+
+    for name in names:
+        try:
+            raw = name.encode("latin-1")
+        except UnicodeEncodeError:
+            total, soul, _ = _wide_scan(name, system, False)
+        else:
+            total = sum(raw.translate(table))
+            soul = sum(raw.translate(vowel_table))
+        add_et(total)
+        add_e(reduce(total, False))
+        add_st(soul)
+        add_s(reduce(soul, False))
+        add_pt(total - soul)
+        add_p(reduce(total - soul, False))
+    return cols
@@ -1,4 +1,7 @@
 # core/numerology_calculations.py
+from .metrics import timed
+from .systems import DEFAULT_SYSTEM, get_system
+
 def digit_sum(n):
     return sum(int(i) for i in str(n))
 
@@ -16,21 +19,9 @@ def compute_bhagyank(dob):
     total = digit_sum(dob.day) + digit_sum(dob.month) + digit_sum(dob.year)
     return reduce_to_single_digit(total)
 
-def compute_name_number(name):
-    """Chaldean name sum and reduction"""
-    mapping = {
-        'A':1,'I':1,'J':1,'Q':1,'Y':1,
-        'B':2,'K':2,'R':2,
-        'C':3,'G':3,'L':3,'S':3,
-        'D':4,'M':4,'T':4,
-        'E':5,'H':5,'N':5,'X':5,
-        'U':6,'V':6,'W':6,
-        'O':7,'Z':7,
-        'F':8,'P':8
-    }
-    total = sum(mapping.get(ch.upper(), 0) for ch in name if ch.isalpha())
-    reduced = reduce_to_single_digit(total)
-    return total, reduced
+def compute_name_number(name, system=DEFAULT_SYSTEM):
+    """Name sum and reduction to 1-9 (Chaldean unless another system is named)"""
+    return get_system(system).name_number(name)
 
 def compute_angel_number(dob, gender):
     """Compute Angel Number"""
@@ -43,11 +34,12 @@ def compute_angel_number(dob, gender):
         result = year_sum
     return reduce_to_single_digit(abs(result))
 
-def calculate_all(name, dob, gender):
+@timed("calculate")
+def calculate_all(name, dob, gender, system=DEFAULT_SYSTEM):
     """Combine all numerology calculations"""
     mulank = compute_mulank(dob)
     bhagyank = compute_bhagyank(dob)
-    name_total, name_reduced = compute_name_number(name)
+    name_total, name_reduced = compute_name_number(name, system)
     angel_number = compute_angel_number(dob, gender)
 
     return {
@@ -1,73 +1,260 @@
 # core/pdf_report.py
 
+import io
 import os
+import time
+import hashlib
+import threading
+from contextlib import contextmanager
+from reportlab import rl_config
 from reportlab.pdfgen import canvas
 from reportlab.lib.pagesizes import A4
 from reportlab.lib import colors
 from reportlab.lib.units import mm
-from PIL import Image
+from reportlab.lib.utils import ImageReader
+
+from .text_layout import string_width, wrap_text, PageFlow
+from .fonts import text_font
+from .metrics import span, timed
+from .memprof import profiled
+from .name_analysis import analyze_name
 
 # ----------------------------------------------------
 # ALWAYS SAFE FONT — No external file needed
+# Text outside its charset switches to a registered TTF (see core/fonts.py)
 # ----------------------------------------------------
 FONT_NAME = "Helvetica"   # Built-in, guaranteed to work
 
+# Bump whenever the report layout changes so cached PDFs are regenerated
+TEMPLATE_VERSION = 6
+
+# ----------------------------------------------------
+# Binary streams — ASCII85 only matters for 7-bit transports and inflates
+# every compressed stream by a quarter. reportlab reads the switch from the
+# global rl_config throughout a render, so it is turned off only while one
+# of our reports is being written and restored once the last one finishes;
+# other reportlab users in the process keep their setting.
+# ----------------------------------------------------
+_a85_lock = threading.Lock()
+_a85_users = 0
+_a85_saved = None
+
+
+@contextmanager
+def _binary_streams():
+    global _a85_users, _a85_saved
+    with _a85_lock:
+        if _a85_users == 0:
+            _a85_saved = rl_config.useA85
+            rl_config.useA85 = 0
+        _a85_users += 1
+    try:
+        yield
+    finally:
+        with _a85_lock:
+            _a85_users -= 1
+            if _a85_users == 0:
+                rl_config.useA85 = _a85_saved
+
+
+# ----------------------------------------------------
+# OUTPUT PROFILES
+#   dpi          — Lo Shu raster resolution at its printed size (None = source)
+#   color_mode   — "RGB" flattens alpha onto `background`, "RGBA" keeps a soft mask
+#   image_format — "JPEG" (DCT) or "FLATE" (lossless)
+# ----------------------------------------------------
+PDF_PROFILES = {
+    "screen": {
+        "dpi": 110, "color_mode": "RGB", "background": (20, 20, 20),
+        "image_format": "JPEG", "jpeg_quality": 72, "page_compression": 1,
+    },
+    "print": {
+        "dpi": 300, "color_mode": "RGB", "background": (20, 20, 20),
+        "image_format": "JPEG", "jpeg_quality": 92, "page_compression": 1,
+    },
+    "archive": {
+        "dpi": None, "color_mode": "RGBA", "background": (20, 20, 20),
+        "image_format": "FLATE", "jpeg_quality": None, "page_compression": 1,
+    },
+}
+DEFAULT_PROFILE = "print"
+
 
 # ----------------------------------------------------
 # Draw chip tag (keyword pill)
 # ----------------------------------------------------
-def _draw_chip_safe(c: canvas.Canvas, x: float, y: float, text: str):
-    pad_x = 2.5 * mm
-    pad_y = 1.5 * mm
+CHIP_PAD_X = 2.5 * mm
+CHIP_GAP = 2 * mm
+CHIP_ROW_H = 10 * mm
+
+LETTER_CELL_W = 7 * mm
+LETTER_ROW_H = 11 * mm
+VOWEL_COLOR = "#FFD180"
+
 
-    c.setFont(FONT_NAME, 9)
+def _chip_width(text: str) -> float:
+    return string_width(text, text_font(text), 9) + CHIP_PAD_X * 2
 
-    width = c.stringWidth(text, FONT_NAME, 9)
-    box_w = width + pad_x * 2
+
+def _draw_text(c: canvas.Canvas, x: float, y: float, text: str, size: float):
+    """drawString with a font that can render every character of `text`."""
+    c.setFont(text_font(text), size)
+    c.drawString(x, y, text)
+
+
+def _draw_chip_safe(c: canvas.Canvas, x: float, y: float, text: str):
+    pad_x = CHIP_PAD_X
+
+    box_w = _chip_width(text)
     box_h = 6 * mm
 
     c.setFillColor(colors.HexColor("#1E2A3A"))
     c.roundRect(x, y, box_w, box_h, 2 * mm, fill=1, stroke=0)
 
     c.setFillColor(colors.HexColor("#E7F3FF"))
-    c.drawString(x + pad_x, y + 1.5 * mm, text)
+    _draw_text(c, x + pad_x, y + 1.5 * mm, text, 9)
+
+    return box_w + CHIP_GAP
 
-    return box_w + 2 * mm
+
+def _layout_chips(keywords, left: float, right: float):
+    """Place chips left to right, wrapping before a chip would cross `right`. Returns rows of (x, text)."""
+    rows = []
+    row = []
+    x = left
+    for kw in keywords:
+        w = _chip_width(kw)
+        if row and x + w > right:
+            rows.append(row)
+            row = []
+            x = left
+        row.append((x, kw))
+        x += w + CHIP_GAP
+    if row:
+        rows.append(row)
+    return rows
 
 
 # ----------------------------------------------------
-# MAIN PDF GENERATOR
+# Shared page resources (form XObjects)
 # ----------------------------------------------------
-def create_pdf_report(filepath: str, payload: dict):
+HEADER_FORM = "report_header"
+LOSHU_MAX_DIM = 80 * mm
+
+
+def _use_header_form(c: canvas.Canvas, defined: dict, x: float, y: float):
+    """Draw the report title through a form XObject defined once per document."""
+    if HEADER_FORM not in defined:
+        c.beginForm(HEADER_FORM)
+        c.setFont(FONT_NAME, 22)
+        c.setFillColor(colors.HexColor("#80D8FF"))
+        c.drawString(0, 0, "Numerology Report")
+        c.endForm()
+        defined[HEADER_FORM] = True
+
+    c.saveState()
+    c.translate(x, y)
+    c.doForm(HEADER_FORM)
+    c.restoreState()
+
 
-    c = canvas.Canvas(filepath, pagesize=A4)
+def _prepare_image(data: bytes, draw_w: float, draw_h: float, profile: dict):
+    """Resample, flatten and encode the raster as the profile asks. Returns (ImageReader, mask)."""
+    from PIL import Image
+
+    img = Image.open(io.BytesIO(data))
+    img.load()
+
+    if profile["dpi"]:
+        target = (
+            max(1, round(draw_w / 72 * profile["dpi"])),
+            max(1, round(draw_h / 72 * profile["dpi"])),
+        )
+        if target[0] < img.width:
+            img = img.resize(target, Image.LANCZOS)
+
+    if profile["color_mode"] == "RGB" or profile["image_format"] == "JPEG":
+        if img.mode in ("RGBA", "LA", "P"):
+            img = img.convert("RGBA")
+            flat = Image.new("RGB", img.size, profile["background"])
+            flat.paste(img, mask=img.getchannel("A"))
+            img = flat
+        else:
+            img = img.convert("RGB")
+        mask = None
+    else:
+        img = img.convert("RGBA")
+        mask = "auto"
+
+    if profile["image_format"] == "JPEG":
+        buf = io.BytesIO()
+        img.save(buf, "JPEG", quality=profile["jpeg_quality"], optimize=True)
+        buf.seek(0)
+        return ImageReader(buf), mask
+    return ImageReader(img), mask
+
+
+def _use_image_form(c: canvas.Canvas, defined: dict, img_path: str, right: float, top: float, profile: dict):
+    """
+    Draw the Lo Shu image through a form XObject keyed by file content, so
+    identical grids (same digit frequencies) are stored once per document.
+    """
+    with open(img_path, "rb") as fh:
+        data = fh.read()
+    name = "loshu_" + hashlib.sha1(data).hexdigest()
+
+    if name not in defined:
+        w_img, h_img = ImageReader(io.BytesIO(data)).getSize()
+    else:
+        w_img, h_img = defined[name]
+
+    scale = min(LOSHU_MAX_DIM / w_img, LOSHU_MAX_DIM / h_img)
+    draw_w = w_img * scale
+    draw_h = h_img * scale
+
+    if name not in defined:
+        with span("pdf_image"):
+            reader, mask = _prepare_image(data, draw_w, draw_h, profile)
+        c.beginForm(name, 0, 0, draw_w, draw_h)
+        c.drawImage(reader, 0, 0, draw_w, draw_h, mask=mask)
+        c.endForm()
+        defined[name] = (w_img, h_img)
+
+    c.saveState()
+    c.translate(right - draw_w, top - draw_h)
+    c.doForm(name)
+    c.restoreState()
+
+
+# ----------------------------------------------------
+# REPORT BODY (one person, may span pages)
+# ----------------------------------------------------
+def _draw_report(c: canvas.Canvas, payload: dict, forms: dict, profile: dict):
     W, H = A4
 
     LEFT = 22 * mm
     RIGHT = W - 22 * mm
     TOP = H - 22 * mm
+    BOTTOM = 22 * mm
 
     y = TOP
 
     # -------------------------------------------------
     # HEADER
     # -------------------------------------------------
-    c.setFont(FONT_NAME, 22)
-    c.setFillColor(colors.HexColor("#80D8FF"))
-    c.drawString(LEFT, y, "Numerology Report")
+    _use_header_form(c, forms, LEFT, y)
     y -= 16 * mm
 
     # -------------------------------------------------
     # USER INFO
     # -------------------------------------------------
-    c.setFont(FONT_NAME, 12)
     c.setFillColor(colors.white)
 
-    c.drawString(LEFT, y, f"Name: {payload['name']}")
+    _draw_text(c, LEFT, y, f"Name: {payload['name']}", 12)
     y -= 6 * mm
-    c.drawString(LEFT, y, f"DOB: {payload['dob'].strftime('%d-%m-%Y')}")
+    _draw_text(c, LEFT, y, f"DOB: {payload['dob'].strftime('%d-%m-%Y')}", 12)
     y -= 6 * mm
-    c.drawString(LEFT, y, f"Gender: {payload['gender']}")
+    _draw_text(c, LEFT, y, f"Gender: {payload['gender']}", 12)
     y -= 12 * mm
 
     # -------------------------------------------------
@@ -100,87 +287,194 @@ def create_pdf_report(filepath: str, payload: dict):
 
     if img_path and os.path.exists(img_path):
         try:
-            img = Image.open(img_path)
-            w_img, h_img = img.size
+            _use_image_form(c, forms, img_path, RIGHT, TOP, profile)
+        except Exception as e:
+            print("Image error:", e)
 
-            max_dim = 80 * mm
-            scale = min(max_dim / w_img, max_dim / h_img)
+    # -------------------------------------------------
+    # NAME NUMBERS (below the grid image)
+    # -------------------------------------------------
+    flow = PageFlow(c, TOP, BOTTOM, y)
 
-            draw_w = w_img * scale
-            draw_h = h_img * scale
+    analysis = payload.get("name_analysis") or analyze_name(payload["name"], breakdown=True)
+    letters = analysis.get("Letters") or []
+    per_row = max(1, int((RIGHT - LEFT - 4 * mm) // LETTER_CELL_W))
+    letter_rows = [letters[i:i + per_row] for i in range(0, len(letters), per_row)]
 
-            c.drawInlineImage(
-                img_path,
-                RIGHT - draw_w,
-                TOP - draw_h,
-                draw_w,
-                draw_h
-            )
-        except Exception as e:
-            print("Image error:", e)
+    flow.keep_together(10 * mm + 3 * 7 * mm + 2 * mm + len(letter_rows) * LETTER_ROW_H + 6 * mm)
+    c.setFillColor(colors.HexColor("#80D8FF"))
+    _draw_text(c, LEFT, flow.y, "Name Numbers", 16)
+    flow.advance(10 * mm)
+
+    c.setFont(FONT_NAME, 12)
+    for label, note in [
+        ("Expression", "all letters"),
+        ("Soul Urge", "vowels"),
+        ("Personality", "consonants"),
+    ]:
+        master = analysis.get(label + " Master")
+        master_note = f", master number {master}" if master else ""
+        c.setFillColor(colors.white)
+        c.drawString(LEFT + 4 * mm, flow.y,
+                     f"{label}: {analysis[label]} (Total {analysis[label + ' Total']}{master_note}, {note})")
+        flow.advance(7 * mm)
+    flow.advance(2 * mm)
+
+    # letter-by-letter values, vowels highlighted
+    for row in letter_rows:
+        flow.ensure(LETTER_ROW_H)
+        x = LEFT + 4 * mm
+        for letter, value, vowel in row:
+            c.setFillColor(colors.HexColor(VOWEL_COLOR) if vowel else colors.white)
+            c.setFont(FONT_NAME, 12)
+            c.drawCentredString(x + LETTER_CELL_W / 2, flow.y, letter)
+            c.setFont(FONT_NAME, 9)
+            c.drawCentredString(x + LETTER_CELL_W / 2, flow.y - 4.5 * mm, str(value))
+            x += LETTER_CELL_W
+        flow.advance(LETTER_ROW_H)
 
     # -------------------------------------------------
     # PHASE ANALYSIS
     # -------------------------------------------------
-    y -= 10 * mm
+    flow.advance(6 * mm)
 
-    c.setFont(FONT_NAME, 16)
+    flow.keep_together(12 * mm + 24 * mm)
     c.setFillColor(colors.HexColor("#80D8FF"))
-    c.drawString(LEFT, y, "Driver–Conductor Analysis")
-    y -= 12 * mm
+    _draw_text(c, LEFT, flow.y, "Driver–Conductor Analysis", 16)
+    flow.advance(12 * mm)
 
     phases = payload["phases"]
+    text_left = LEFT + 4 * mm
 
     for ph in ["0-40", "40-80"]:
         entry = phases[ph]
 
+        meaning_font = text_font(entry["meaning_raw"])
+        meaning_lines = wrap_text(entry["meaning_raw"], meaning_font, 11, RIGHT - text_left)
+        chip_rows = _layout_chips(entry["meaning_clean"], text_left, RIGHT)
+        block_h = (
+            10 * mm + 8 * mm
+            + len(meaning_lines) * 6 * mm + 4 * mm
+            + len(chip_rows) * CHIP_ROW_H
+        )
+        flow.keep_together(block_h)
+
         # title
-        c.setFont(FONT_NAME, 13)
         c.setFillColor(colors.HexColor("#A7D8FF"))
-        c.drawString(
+        _draw_text(
+            c,
             LEFT,
-            y,
+            flow.y,
             "0–40 Years (Mulank → Bhagyank)" if ph == "0-40"
-            else "40–80 Years (Bhagyank → Mulank)"
+            else "40–80 Years (Bhagyank → Mulank)",
+            13
         )
-        y -= 10 * mm
+        flow.advance(10 * mm)
 
         # stars & rating
-        c.setFont(FONT_NAME, 12)
         c.setFillColor(colors.yellow)
-        c.drawString(LEFT, y, f"Stars: {entry['stars_raw']}")
+        _draw_text(c, LEFT, flow.y, f"Stars: {entry['stars_raw']}", 12)
         c.setFillColor(colors.HexColor("#C8D8FF"))
-        c.drawString(LEFT + 45 * mm, y, f"Rating: {entry['rating_clean']}")
-        y -= 8 * mm
-
-        # meaning
-        c.setFont(FONT_NAME, 11)
-        c.setFillColor(colors.white)
+        _draw_text(c, LEFT + 45 * mm, flow.y, f"Rating: {entry['rating_clean']}", 12)
+        flow.advance(8 * mm)
 
-        for line in entry["meaning_raw"].split(". "):
-            c.drawString(LEFT + 4 * mm, y, line.strip())
-            y -= 6 * mm
+        # meaning (wrapped)
+        for line in meaning_lines:
+            flow.ensure(6 * mm)
+            c.setFont(meaning_font, 11)
+            c.setFillColor(colors.white)
+            c.drawString(text_left, flow.y, line)
+            flow.advance(6 * mm)
 
-        y -= 4 * mm
+        flow.advance(4 * mm)
 
         # Keywords chips
-        chip_x = LEFT + 4 * mm
-        chip_y = y
+        for row in chip_rows:
+            flow.ensure(CHIP_ROW_H)
+            for chip_x, kw in row:
+                _draw_chip_safe(c, chip_x, flow.y, kw)
+            flow.advance(CHIP_ROW_H)
 
-        for kw in entry["meaning_clean"]:
-            used_w = _draw_chip_safe(c, chip_x, chip_y, kw)
-            chip_x += used_w
+        flow.advance(2 * mm)
 
-            if chip_x > RIGHT - 25 * mm:
-                chip_x = LEFT + 4 * mm
-                chip_y -= 10 * mm
-                y -= 10 * mm
+    c.showPage()
 
-        y = chip_y - 12 * mm
 
-        if y < 40 * mm:
-            c.showPage()
-            y = TOP - 20 * mm
+# ----------------------------------------------------
+# MAIN PDF GENERATOR
+# ----------------------------------------------------
+def _output_size(filepath) -> int:
+    if hasattr(filepath, "tell"):
+        return filepath.tell()
+    return os.path.getsize(filepath)
+
+
+@timed("pdf_report")
+@profiled("pdf_report")
+def create_pdf_report(filepath: str, payload: dict, profile: str = DEFAULT_PROFILE) -> dict:
+    """
+    Write a single report. `filepath` may also be a binary file object.
+    Returns {"profile", "bytes", "seconds"} for the generated file.
+    """
+    settings = PDF_PROFILES[profile]
+    start = time.perf_counter()
+
+    with _binary_streams():
+        c = canvas.Canvas(filepath, pagesize=A4, pageCompression=settings["page_compression"])
+        with span("pdf_draw"):
+            _draw_report(c, payload, {}, settings)
+        with span("pdf_save"):
+            c.save()
+
+    return {
+        "profile": profile,
+        "bytes": _output_size(filepath),
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def compare_profiles(payload: dict, profiles=None) -> list:
+    """Render `payload` in memory once per profile and return each profile's size and time."""
+    stats = []
+    for name in profiles or PDF_PROFILES:
+        stats.append(create_pdf_report(io.BytesIO(), payload, profile=name))
+    return stats
 
-    c.showPage()
-    c.save()
+
+# ----------------------------------------------------
+# BATCH GENERATOR — many people, one PDF
+# ----------------------------------------------------
+@timed("pdf_batch")
+@profiled("pdf_batch")
+def create_pdf_batch_report(filepath: str, payloads, profile: str = DEFAULT_PROFILE) -> int:
+    """
+    Write one report per payload into a single PDF.
+
+    Fonts, the header form and Lo Shu images are shared across the whole
+    document (identical grids are embedded once). Each person gets an
+    outline bookmark. `payloads` may be any iterable, including a generator,
+    so callers can page through large client lists without holding them all;
+    finished pages are kept compressed until save.
+    Returns the number of reports written.
+    """
+    settings = PDF_PROFILES[profile]
+    with _binary_streams():
+        c = canvas.Canvas(filepath, pagesize=A4, pageCompression=settings["page_compression"])
+        forms = {}
+        count = 0
+
+        for payload in payloads:
+            key = f"person_{count}"
+            c.bookmarkPage(key)
+            c.addOutlineEntry(
+                f"{payload['name']} ({payload['dob'].strftime('%d-%m-%Y')})",
+                key,
+                level=0
+            )
+            _draw_report(c, payload, forms, settings)
+            count += 1
+
+        if count:
+            c.showOutline()
+        c.save()
+    return count
@@ -0,0 +1,237 @@
+# core/report_cache.py
+"""
+Content-addressed on-disk cache of generated PDF reports.
+Provides:
+  - report_key(payload, **options): stable hash of the payload as rendered + template version
+  - ReportCache(directory, max_bytes, max_age): get / put / get_or_render
+
+Entries are written to a temp file in the cache directory and moved into
+place with os.replace, so readers in other processes never see partial files.
+Eviction tolerates entries vanishing underneath it, so several worker
+processes can share one directory without locking. Within a process,
+concurrent get_or_render() calls for one key render it once. The cache's
+size is tracked as entries are written; the directory is only scanned every
+EVICT_EVERY puts or when the size budget is exceeded.
+"""
+
+import hashlib
+import io
+import json
+import os
+import tempfile
+import time
+from datetime import date, datetime
+
+from .pdf_report import TEMPLATE_VERSION, DEFAULT_PROFILE
+from .singleflight import SingleFlight
+
+SUFFIX = ".pdf"
+STALE_TMP_AGE = 3600   # temp files older than this were left by a crashed writer
+EVICT_EVERY = 100      # puts between full directory scans
+LOW_WATER = 0.9        # eviction frees space down to this share of max_bytes
+KEY_VERSION = 2        # bumped when the key's fields change (1 folded the case of gender)
+
+
+# ----------------------------------------------------
+# Key
+# ----------------------------------------------------
+def _normalize(value):
+    """Turn payload values into plain JSON types with a fixed ordering."""
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in sorted(value.items(), key=lambda kv: str(kv[0]))}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+_image_digests = {}   # (path, size, mtime_ns) -> sha256 of the file
+MAX_IMAGE_DIGESTS = 1024
+
+
+def _image_digest(path):
+    """Content hash of the embedded grid image; None when there is none to embed."""
+    if not path:
+        return None
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    memo = (path, st.st_size, st.st_mtime_ns)
+    digest = _image_digests.get(memo)
+    if digest is None:
+        try:
+            with open(path, "rb") as fh:
+                digest = hashlib.sha256(fh.read()).hexdigest()
+        except OSError:
+            return None
+        if len(_image_digests) >= MAX_IMAGE_DIGESTS:
+            _image_digests.clear()
+        _image_digests[memo] = digest
+    return digest
+
+
+def report_key(payload: dict, **options) -> str:
+    """
+    Hash of everything that affects the PDF, including the content of the
+    embedded Lo Shu image (not its path) and the numerology system of the
+    name analysis. Name and gender are hashed exactly as the report prints
+    them. TEMPLATE_VERSION covers changes to the renderer itself.
+    """
+    from .systems import DEFAULT_SYSTEM
+
+    analysis = payload.get("name_analysis") or {}
+    normalized = {
+        "key": KEY_VERSION,
+        "template": TEMPLATE_VERSION,
+        "name": str(payload["name"]),
+        "dob": _normalize(payload["dob"]),
+        "gender": str(payload["gender"]),
+        "results": _normalize(payload["results"]),
+        "phases": _normalize(payload["phases"]),
+        "image": _image_digest(payload.get("loshu_image")),
+        "analysis_system": analysis.get("System", DEFAULT_SYSTEM),
+        "options": _normalize(options),
+    }
+    blob = json.dumps(normalized, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+# ----------------------------------------------------
+# Cache
+# ----------------------------------------------------
+class ReportCache:
+    def __init__(self, directory: str, max_bytes: int = 256 * 1024 * 1024, max_age: float = 30 * 24 * 3600):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.flights = SingleFlight()
+        # bytes on disk as of the last scan plus this process's puts since;
+        # other processes' writes and expiry are picked up by the next scan
+        self._size = None
+        self._puts = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + SUFFIX)
+
+    def get(self, key: str):
+        """Return cached PDF bytes, or None on a miss or an expired entry."""
+        path = self._path(key)
+        try:
+            with open(path, "rb") as fh:
+                if self.max_age is not None and time.time() - os.fstat(fh.fileno()).st_mtime > self.max_age:
+                    data = None
+                else:
+                    data = fh.read()
+        except FileNotFoundError:
+            return None
+
+        if data is None:
+            self._remove(path)
+        return data
+
+    def put(self, key: str, data: bytes):
+        path = self._path(key)
+        try:
+            replaced = os.stat(path).st_size
+        except FileNotFoundError:
+            replaced = 0
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                fh.write(data)
+                fh.flush()
+                os.fsync(fh.fileno())
+            os.replace(tmp, path)
+        except BaseException:
+            try:
+                os.remove(tmp)
+            except FileNotFoundError:
+                pass
+            raise
+
+        self._puts += 1
+        if self._size is not None:
+            self._size += len(data) - replaced
+        over = self.max_bytes is not None and self._size is not None and self._size > self.max_bytes
+        if self._size is None or over or self._puts >= EVICT_EVERY:
+            self.evict()
+
+    def get_or_render(self, payload: dict, **options) -> bytes:
+        """Cached PDF bytes for `payload`; renders and stores them on a miss."""
+        options.setdefault("profile", DEFAULT_PROFILE)
+        key = report_key(payload, **options)
+        data = self.get(key)
+        if data is not None:
+            return data
+        return self.flights.do(key, self._render, key, payload, options)
+
+    def _render(self, key: str, payload: dict, options: dict) -> bytes:
+        from .pdf_report import create_pdf_report
+
+        # a caller that just finished this key may have stored it meanwhile
+        data = self.get(key)
+        if data is not None:
+            return data
+
+        buf = io.BytesIO()
+        create_pdf_report(buf, payload, **options)
+        data = buf.getvalue()
+        self.put(key, data)
+        return data
+
+    def evict(self):
+        """
+        Drop expired entries, then, when over max_bytes, the oldest ones until
+        the cache is down to LOW_WATER of it, so a full cache is not rescanned
+        on every put.
+        """
+        now = time.time()
+        entries = []
+        total = 0
+
+        for entry in os.scandir(self.directory):
+            try:
+                st = entry.stat()
+            except FileNotFoundError:
+                continue
+            if entry.name.endswith(".tmp"):
+                if now - st.st_mtime > STALE_TMP_AGE:
+                    self._remove(entry.path)
+                continue
+            if not entry.name.endswith(SUFFIX):
+                continue
+            if self.max_age is not None and now - st.st_mtime > self.max_age:
+                self._remove(entry.path)
+                continue
+            entries.append((st.st_mtime, st.st_size, entry.path))
+            total += st.st_size
+
+        if self.max_bytes is not None and total > self.max_bytes:
+            target = self.max_bytes * LOW_WATER
+            entries.sort()
+            for _, size, path in entries:
+                if total <= target:
+                    break
+                self._remove(path)
+                total -= size
+
+        self._size = total
+        self._puts = 0
+
+    def clear(self):
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(SUFFIX):
+                self._remove(entry.path)
+        self._size = 0
+
+    @staticmethod
+    def _remove(path: str):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
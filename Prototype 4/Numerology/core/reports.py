@@ -0,0 +1,87 @@
+# core/reports.py
+"""
+Headless building blocks for producing grids and reports outside the GUI.
+Provides:
+  - build_payload(name, dob, gender, grid_dir, grid_size): report payload with a rendered grid file
+  - render_grid_png(digits, size): Lo Shu grid as PNG bytes
+  - render_report_pdf(name, dob, gender, profile, grid_dir): PDF bytes
+
+Everything here is a plain module-level function taking and returning
+picklable values, so it can run in a ProcessPoolExecutor worker. Threads in
+one process asking for the same grid file at once render it only once.
+"""
+
+import io
+import os
+import tempfile
+
+from .numerology_calculations import calculate_all
+from .loshu import loshu_digits, frequency_vector
+from .singleflight import SingleFlight
+from .metrics import span
+
+DEFAULT_GRID_SIZE = 800
+
+grid_flights = SingleFlight()
+
+
+def grid_path(grid_dir: str, digits, size: int) -> str:
+    """One file per frequency vector and size; the same naming as the GUI's temp grids."""
+    key = "".join(str(n) for n in frequency_vector(digits))
+    return os.path.join(grid_dir, f"loshu_{key}_{size}.png")
+
+
+def render_grid_png(digits, size: int = 520) -> bytes:
+    from .loshu import render_loshu_grid
+
+    img = render_loshu_grid(list(digits), size=size)
+    buf = io.BytesIO()
+    with span("png_encode"):
+        img.save(buf, format="PNG")
+    return buf.getvalue()
+
+
+def ensure_grid_file(grid_dir: str, digits, size: int = DEFAULT_GRID_SIZE) -> str:
+    """Path of the grid PNG for `digits`, rendering it first if no process has yet."""
+    path = grid_path(grid_dir, digits, size)
+    if os.path.exists(path):
+        return path
+    return grid_flights.do(path, _write_grid_file, grid_dir, path, digits, size)
+
+
+def _write_grid_file(grid_dir: str, path: str, digits, size: int) -> str:
+    os.makedirs(grid_dir, exist_ok=True)
+    data = render_grid_png(digits, size)
+    fd, tmp = tempfile.mkstemp(dir=grid_dir, suffix=".tmp")
+    with os.fdopen(fd, "wb") as fh:
+        fh.write(data)
+    os.replace(tmp, path)
+    return path
+
+
+def build_payload(name: str, dob, gender: str, grid_dir: str, grid_size: int = DEFAULT_GRID_SIZE) -> dict:
+    """The dict create_pdf_report() expects, with the grid rendered into `grid_dir`."""
+    from .driver_conductor import get_phase_analysis
+    from .name_analysis import analyze_name
+
+    results = calculate_all(name, dob, gender)
+    digits = loshu_digits(dob, results)
+    return {
+        "name": name,
+        "dob": dob,
+        "gender": gender,
+        "results": results,
+        "phases": get_phase_analysis(results["Mulank"], results["Bhagyank"]),
+        "name_analysis": analyze_name(name, breakdown=True),
+        "loshu_image": ensure_grid_file(grid_dir, digits, grid_size),
+    }
+
+
+def render_report_pdf(name: str, dob, gender: str, profile: str = None, grid_dir: str = None) -> bytes:
+    from .pdf_report import create_pdf_report, DEFAULT_PROFILE
+
+    grid_dir = grid_dir or os.path.join(tempfile.gettempdir(), "numerology_grids")
+    payload = build_payload(name, dob, gender, grid_dir)
+    buf = io.BytesIO()
+    create_pdf_report(buf, payload, profile=profile or DEFAULT_PROFILE)
+    return buf.getvalue()
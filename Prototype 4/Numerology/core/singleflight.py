@@ -0,0 +1,108 @@
+# core/singleflight.py
+"""
+Request coalescing: concurrent calls with the same key share one execution.
+Provides:
+  - SingleFlight: for threads — do(key, fn, *args, **kwargs)
+  - AsyncSingleFlight: for asyncio — await do(key, coro_fn, *args, **kwargs)
+
+Only calls that overlap are coalesced; once the leader finishes, the next
+call with that key runs again (results are not cached here). Errors raised
+by the leader are raised in every waiting caller too.
+
+Both keep counters, available from stats():
+  calls      — every do()
+  executions — calls that actually ran the work
+  coalesced  — calls that waited for someone else's execution
+"""
+
+import asyncio
+import threading
+
+
+class _Call:
+    __slots__ = ("done", "value", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class SingleFlight:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.calls = 0
+        self.executions = 0
+        self.coalesced = 0
+
+    def do(self, key, fn, *args, **kwargs):
+        with self._lock:
+            self.calls += 1
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.executions += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value
+
+        try:
+            call.value = fn(*args, **kwargs)
+            return call.value
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "executions": self.executions,
+                "coalesced": self.coalesced,
+                "in_flight": len(self._calls),
+            }
+
+
+class AsyncSingleFlight:
+    """
+    The work runs as its own task, so a caller that is cancelled (e.g. its
+    client disconnected) does not cancel it for the others still waiting.
+    Use from a single event loop.
+    """
+
+    def __init__(self):
+        self._tasks = {}
+        self.calls = 0
+        self.executions = 0
+        self.coalesced = 0
+
+    async def do(self, key, coro_fn, *args, **kwargs):
+        self.calls += 1
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(coro_fn(*args, **kwargs))
+            self._tasks[key] = task
+            task.add_done_callback(lambda _t: self._tasks.pop(key, None))
+            self.executions += 1
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def stats(self) -> dict:
+        return {
+            "calls": self.calls,
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._tasks),
+        }
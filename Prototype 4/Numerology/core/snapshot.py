@@ -0,0 +1,201 @@
+# core/snapshot.py
+"""
+Columnar snapshots of computed results (NumPy, imported on first use).
+Provides:
+  - export_snapshot(path, cols): write a core.bulk.ClientColumns to an uncompressed .npz
+  - load_snapshot(path, mmap=True) -> Snapshot: columns memory-mapped straight from the file
+
+Every column has a fixed-width dtype, so one row is a fixed number of bytes
+and a 10-million-row snapshot opens without reading it: the loader finds
+each member's offset in the zip, parses the .npy header with np.lib.format
+and maps the data in place. Members are written uncompressed and padded
+(like zipalign) so the data of each starts on a 64-byte boundary.
+
+Columns:
+  name          S<n>          UTF-8, padded
+  dob           datetime64[D]
+  gender        uint8         index into GENDERS
+  mulank, bhagyank, name_number, angel   uint8
+  name_total    uint32
+  phase_keys    uint8 (n, 2, 2)   [phase][driver, conductor] for 0-40 and 40-80
+  rating        float32 (n, 2)    driver-conductor rating per phase, NaN if unrated
+  freq          uint8 (n, 9)      Lo Shu frequency vector (counts of 1..9)
+"""
+
+import json
+import struct
+import zipfile
+from datetime import date
+
+SNAPSHOT_VERSION = 1
+GENDERS = ("Other", "Male", "Female")
+META_MEMBER = "__meta__"
+ALIGN = 64
+PAD_EXTRA_ID = 0xD935   # same header id zipalign uses for padding
+_EPOCH = date(1970, 1, 1).toordinal()
+
+
+# ----------------------------------------------------
+# Export
+# ----------------------------------------------------
+def _columns(cols) -> dict:
+    import numpy as np
+    from .driver_conductor import get_dc_analysis
+
+    cols.ensure_all()
+    n = len(cols)
+
+    encoded = [name.encode("utf-8") for name in cols.names]
+    width = max((len(b) for b in encoded), default=1) or 1
+    gender_codes = {g.lower(): i for i, g in enumerate(GENDERS)}
+
+    mulank = np.frombuffer(cols.mulank, dtype=np.int8).astype(np.uint8)
+    bhagyank = np.frombuffer(cols.bhagyank, dtype=np.int8).astype(np.uint8)
+
+    phase_keys = np.empty((n, 2, 2), dtype=np.uint8)
+    phase_keys[:, 0, 0] = phase_keys[:, 1, 1] = mulank
+    phase_keys[:, 0, 1] = phase_keys[:, 1, 0] = bhagyank
+
+    # ratings depend only on the pair: look up 81 entries, then index
+    table = np.full((10, 10), np.nan, dtype=np.float32)
+    for d in range(1, 10):
+        for c in range(1, 10):
+            r = get_dc_analysis(d, c)["rating_clean"]
+            if r is not None:
+                table[d, c] = r
+    rating = np.stack([table[mulank, bhagyank], table[bhagyank, mulank]], axis=1)
+
+    return {
+        "name": np.array(encoded, dtype=f"S{width}"),
+        "dob": (np.array([d.toordinal() for d in cols.dobs], dtype=np.int64) - _EPOCH).astype("datetime64[D]"),
+        "gender": np.array([gender_codes.get(g.lower(), 0) for g in cols.genders], dtype=np.uint8),
+        "mulank": mulank,
+        "bhagyank": bhagyank,
+        "name_total": np.frombuffer(cols.name_total, dtype=np.dtype(f"i{cols.name_total.itemsize}")).astype(np.uint32),
+        "name_number": np.frombuffer(cols.name_number, dtype=np.int8).astype(np.uint8),
+        "angel": np.frombuffer(cols.angel, dtype=np.int8).astype(np.uint8),
+        "phase_keys": phase_keys,
+        "rating": rating,
+        "freq": np.array([cols.frequency(i) for i in range(n)], dtype=np.uint8).reshape(n, 9),
+    }
+
+
+def _padding(offset: int, name: str, zip64: bool) -> bytes:
+    """Extra field that makes member data (and so the .npy header) start on ALIGN."""
+    header = 30 + len(name.encode("utf-8")) + (20 if zip64 else 0)
+    pad = (-(offset + header + 4)) % ALIGN
+    return struct.pack("<HH", PAD_EXTRA_ID, pad) + b"\0" * pad
+
+
+def _write_member(zf, name: str, array):
+    import numpy as np
+
+    info = zipfile.ZipInfo(name + ".npy", date_time=(1980, 1, 1, 0, 0, 0))
+    info.compress_type = zipfile.ZIP_STORED
+    zip64 = array.nbytes > (1 << 30)
+    info.extra = _padding(zf.fp.tell(), info.filename, zip64)
+    with zf.open(info, "w", force_zip64=zip64) as fh:
+        np.lib.format.write_array(fh, np.ascontiguousarray(array), allow_pickle=False)
+
+
+def export_snapshot(path: str, cols) -> int:
+    """Write every row of `cols` to `path` and return the row count."""
+    import numpy as np
+
+    columns = _columns(cols)
+    meta = {"version": SNAPSHOT_VERSION, "rows": len(cols), "genders": GENDERS}
+
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_STORED, allowZip64=True) as zf:
+        for name, array in columns.items():
+            _write_member(zf, name, array)
+        _write_member(zf, META_MEMBER, np.frombuffer(json.dumps(meta).encode("utf-8"), dtype=np.uint8))
+    return len(cols)
+
+
+# ----------------------------------------------------
+# Load
+# ----------------------------------------------------
+def _data_offset(fh, info) -> int:
+    """Start of a stored member's bytes, from its local header (its extra field may differ from the central one)."""
+    fh.seek(info.header_offset)
+    local = fh.read(30)
+    if local[:4] != b"PK\x03\x04":
+        raise ValueError(f"Bad local header for {info.filename}")
+    name_len, extra_len = struct.unpack("<HH", local[26:30])
+    return info.header_offset + 30 + name_len + extra_len
+
+
+def _map_member(path: str, fh, info, mmap: bool):
+    import numpy as np
+    from numpy.lib import format as npy
+
+    if info.compress_type != zipfile.ZIP_STORED:
+        raise ValueError(f"{info.filename} is compressed; snapshots must be stored uncompressed")
+
+    fh.seek(_data_offset(fh, info))
+    version = npy.read_magic(fh)
+    if version == (1, 0):
+        shape, fortran, dtype = npy.read_array_header_1_0(fh)
+    else:
+        shape, fortran, dtype = npy.read_array_header_2_0(fh)
+    order = "F" if fortran else "C"
+
+    if mmap:
+        return np.memmap(path, dtype=dtype, mode="r", offset=fh.tell(), shape=shape, order=order)
+    count = int(np.prod(shape, dtype=np.int64))
+    return np.fromfile(fh, dtype=dtype, count=count).reshape(shape, order=order)
+
+
+class Snapshot:
+    """Read-only columns of a snapshot, by name: snap["mulank"], snap["freq"], ..."""
+
+    def __init__(self, columns: dict, meta: dict):
+        self.columns = columns
+        self.meta = meta
+
+    def __len__(self):
+        return self.meta["rows"]
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    def __contains__(self, name):
+        return name in self.columns
+
+    def keys(self):
+        return self.columns.keys()
+
+    def mask(self, **equals):
+        """Boolean row mask for column == value on every given column, e.g. mask(mulank=3, bhagyank=7)."""
+        import numpy as np
+
+        m = np.ones(len(self), dtype=bool)
+        for name, value in equals.items():
+            if name == "gender" and isinstance(value, str):
+                value = self.meta["genders"].index(value.capitalize())
+            m &= self.columns[name] == value
+        return m
+
+    def names(self, rows) -> list:
+        return [b.decode("utf-8") for b in self.columns["name"][rows]]
+
+
+def load_snapshot(path: str, mmap: bool = True) -> Snapshot:
+    """Open a snapshot; with mmap=True nothing is read until a column is used."""
+    columns = {}
+    meta = None
+    with zipfile.ZipFile(path) as zf, open(path, "rb") as fh:
+        for info in zf.infolist():
+            if not info.filename.endswith(".npy"):
+                continue
+            name = info.filename[:-4]
+            if name == META_MEMBER:
+                meta = json.loads(bytes(_map_member(path, fh, info, mmap=False)).decode("utf-8"))
+            else:
+                columns[name] = _map_member(path, fh, info, mmap)
+
+    if meta is None:
+        raise ValueError(f"{path} is not a numerology snapshot")
+    if meta["version"] > SNAPSHOT_VERSION:
+        raise ValueError(f"Snapshot version {meta['version']} is newer than this app supports")
+    return Snapshot(columns, meta)
@@ -0,0 +1,165 @@
+# core/systems.py
+"""
+Numerology systems: letter values and reduction rules, compiled once, on
+first use, into flat lookup tables.
+Provides:
+  - register_system(name, letters, masters, description) -> NumerologySystem
+  - get_system(name) / SYSTEMS / DEFAULT_SYSTEM ("chaldean")
+  - NumerologySystem.name_total(name) / .reduce(total) / .name_number(name)
+  - name_numbers_batch(names, systems) -> {system: (totals, reduced)}
+
+Each system's letter values become a 256-entry byte table indexed by code
+point (both cases, and Latin-1 letters whose upper case is A-Z, e.g. "ß" ->
+"SS"). A name that encodes to Latin-1 is then summed with one
+bytes.translate() and sum(), whatever the system. Other scripts go through
+str.upper() per character, cached per code point. Registration only stores
+the letter values; the tables are built the first time a system is used.
+"""
+
+DEFAULT_SYSTEM = "chaldean"
+MASTER_NUMBERS = (11, 22, 33)
+REDUCE_TABLE_SIZE = 1024   # name totals above this (very long names) reduce in a loop
+
+SYSTEMS = {}
+
+
+def _digit_sum(n: int) -> int:
+    total = 0
+    while n:
+        n, d = divmod(n, 10)
+        total += d
+    return total
+
+
+def _reduce(n: int, masters=()) -> int:
+    while n > 9 and n not in masters:
+        n = _digit_sum(n)
+    return n
+
+
+_reduce_tables = {}   # masters -> bytes, reduced value of every total below REDUCE_TABLE_SIZE
+
+
+def _reduce_table(masters) -> bytes:
+    table = _reduce_tables.get(masters)
+    if table is None:
+        # digit sum of n is digit sum of n // 10 plus the last digit, and is < n for n > 9
+        sums = [0] * REDUCE_TABLE_SIZE
+        out = bytearray(REDUCE_TABLE_SIZE)
+        for n in range(REDUCE_TABLE_SIZE):
+            if n > 9:
+                sums[n] = sums[n // 10] + n % 10
+                out[n] = n if n in masters else out[sums[n]]
+            else:
+                sums[n] = out[n] = n
+        table = _reduce_tables[masters] = bytes(out)
+    return table
+
+
+class NumerologySystem:
+    def __init__(self, name: str, letters: dict, masters=MASTER_NUMBERS, description: str = ""):
+        """`letters` is {value: "LETTERS"}; `masters` are kept by reduce(keep_masters=True)."""
+        self.name = name
+        self.description = description
+        self.masters = tuple(masters)
+        self.values = {ch: value for value, group in letters.items() for ch in group.upper()}
+        self._wide = {}   # code point > 255 -> value, filled as they turn up
+
+    def __repr__(self):
+        return f"<NumerologySystem {self.name}>"
+
+    def __getattr__(self, attr):
+        # the lookup tables are compiled on first use, not at registration,
+        # so importing core does not pay for systems it never touches
+        if attr not in ("table", "_plain", "_master"):
+            raise AttributeError(f"{type(self).__name__!r} object has no attribute {attr!r}")
+        table = bytearray(256)
+        for cp in range(256):
+            table[cp] = sum(self.values.get(u, 0) for u in chr(cp).upper())
+        self.table = bytes(table)
+        self._plain = _reduce_table(())
+        self._master = _reduce_table(self.masters)
+        return getattr(self, attr)
+
+    def _wide_total(self, name: str) -> int:
+        wide, table, total = self._wide, self.table, 0
+        for ch in name:
+            cp = ord(ch)
+            if cp < 256:
+                total += table[cp]
+                continue
+            value = wide.get(cp)
+            if value is None:
+                value = wide[cp] = sum(self.values.get(u, 0) for u in ch.upper())
+            total += value
+        return total
+
+    def name_total(self, name: str) -> int:
+        try:
+            return sum(name.encode("latin-1").translate(self.table))
+        except UnicodeEncodeError:
+            return self._wide_total(name)
+
+    def reduce(self, total: int, keep_masters: bool = True) -> int:
+        if total < REDUCE_TABLE_SIZE:
+            return (self._master if keep_masters else self._plain)[total]
+        return _reduce(total, self.masters if keep_masters else ())
+
+    def name_number(self, name: str, keep_masters: bool = False) -> tuple:
+        """(total, reduced) for a name."""
+        total = self.name_total(name)
+        return total, self.reduce(total, keep_masters)
+
+
+def register_system(name: str, letters: dict, masters=MASTER_NUMBERS, description: str = "") -> NumerologySystem:
+    system = SYSTEMS[name.lower()] = NumerologySystem(name.lower(), letters, masters, description)
+    return system
+
+
+def get_system(system=DEFAULT_SYSTEM) -> NumerologySystem:
+    """A registered system by name (case-insensitive); system objects pass through."""
+    if isinstance(system, NumerologySystem):
+        return system
+    found = SYSTEMS.get(system) or SYSTEMS.get(str(system).lower())
+    if found is None:
+        raise ValueError(f"Unknown numerology system: {system!r} (known: {', '.join(SYSTEMS)})")
+    return found
+
+
+# ----------------------------------------------------
+# Built-in systems
+# ----------------------------------------------------
+CHALDEAN = register_system("chaldean", {
+    1: "AIJQY", 2: "BKR", 3: "CGLS", 4: "DMT", 5: "EHNX", 6: "UVW", 7: "OZ", 8: "FP",
+}, description="Chaldean: values 1-8 by sound; 9 is never assigned")
+
+PYTHAGOREAN = register_system("pythagorean", {
+    1: "AJS", 2: "BKT", 3: "CLU", 4: "DMV", 5: "ENW", 6: "FOX", 7: "GPY", 8: "HQZ", 9: "IR",
+}, description="Pythagorean: A-Z numbered 1-9 in order")
+
+
+# ----------------------------------------------------
+# Batch
+# ----------------------------------------------------
+def name_numbers_batch(names, systems=(DEFAULT_SYSTEM,), keep_masters: bool = False) -> dict:
+    """
+    Name numbers for a whole client list under one or more systems.
+    Returns {system name: (totals array('l'), reduced array('b'))}; each name
+    is encoded once however many systems are asked for.
+    """
+    from array import array   # an extension module; kept off the `core` import path
+
+    compiled = [get_system(s) for s in systems]
+    out = {s.name: (array("l"), array("b")) for s in compiled}
+    columns = [(s, out[s.name][0].append, out[s.name][1].append) for s in compiled]
+
+    for name in names:
+        try:
+            raw = name.encode("latin-1")
+        except UnicodeEncodeError:
+            raw = None
+        for system, add_total, add_reduced in columns:
+            total = sum(raw.translate(system.table)) if raw is not None else system._wide_total(name)
+            add_total(total)
+            add_reduced(system.reduce(total, keep_masters))
+    return out
@@ -0,0 +1,111 @@
+# core/text_layout.py
+"""
+Minimal text layout for the PDF report.
+Provides:
+  - string_width(text, font, size): stringWidth cached on (text, font, size)
+  - wrap_text(text, font, size, max_width): greedy word wrap
+  - PageFlow: vertical cursor with page breaks and keep-together blocks
+"""
+
+from functools import lru_cache
+from typing import List
+
+from reportlab.pdfbase.pdfmetrics import stringWidth
+
+
+# ----------------------------------------------------
+# Cached metrics
+# ----------------------------------------------------
+@lru_cache(maxsize=8192)
+def string_width(text: str, font: str, size: float) -> float:
+    """Width of `text` in points. Keywords and labels repeat across reports, so this mostly hits the cache."""
+    return stringWidth(text, font, size)
+
+
+def _split_long_word(word: str, font: str, size: float, max_width: float) -> List[str]:
+    """Break a single word that is wider than the line, character by character."""
+    parts = []
+    current = ""
+    for ch in word:
+        if current and string_width(current + ch, font, size) > max_width:
+            parts.append(current)
+            current = ch
+        else:
+            current += ch
+    if current:
+        parts.append(current)
+    return parts
+
+
+def wrap_text(text: str, font: str, size: float, max_width: float) -> List[str]:
+    """Greedy word wrap. Returns the lines; empty text gives no lines."""
+    lines = []
+    space_w = string_width(" ", font, size)
+    current = []
+    current_w = 0.0
+
+    for word in (text or "").split():
+        word_w = string_width(word, font, size)
+
+        if word_w > max_width:
+            if current:
+                lines.append(" ".join(current))
+                current, current_w = [], 0.0
+            pieces = _split_long_word(word, font, size, max_width)
+            lines.extend(pieces[:-1])
+            current = [pieces[-1]]
+            current_w = string_width(pieces[-1], font, size)
+            continue
+
+        needed = word_w if not current else current_w + space_w + word_w
+        if current and needed > max_width:
+            lines.append(" ".join(current))
+            current, current_w = [word], word_w
+        else:
+            current.append(word)
+            current_w = needed
+
+    if current:
+        lines.append(" ".join(current))
+    return lines
+
+
+# ----------------------------------------------------
+# Page flow
+# ----------------------------------------------------
+class PageFlow:
+    """
+    Tracks the current y position on a canvas and starts a new page when
+    content would cross the bottom margin.
+    """
+
+    def __init__(self, c, top: float, bottom: float, y: float = None):
+        self.c = c
+        self.top = top
+        self.bottom = bottom
+        self.y = top if y is None else y
+
+    @property
+    def page_height(self) -> float:
+        return self.top - self.bottom
+
+    def new_page(self):
+        self.c.showPage()
+        self.y = self.top
+
+    def ensure(self, height: float):
+        """Break the page unless `height` still fits below the cursor."""
+        if self.y - height < self.bottom:
+            self.new_page()
+
+    def keep_together(self, height: float):
+        """
+        Start a block of known height. It moves to a new page when it does
+        not fit here but would fit on a fresh one; longer blocks start in
+        place and break line by line through `ensure`.
+        """
+        if height <= self.page_height:
+            self.ensure(height)
+
+    def advance(self, height: float):
+        self.y -= height
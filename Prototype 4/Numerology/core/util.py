@@ -8,3 +8,14 @@
 #         base_path = os.path.dirname(__file__)  # directory of this file
 
 #     return os.path.join(base_path, relative_path)
+
+import os
+
+
+def app_data_dir():
+    """Per-user folder for history and caches. NUMEROLOGY_DATA_DIR overrides it."""
+    path = os.environ.get("NUMEROLOGY_DATA_DIR") or os.path.join(
+        os.path.expanduser("~"), ".numerology_analyzer"
+    )
+    os.makedirs(path, exist_ok=True)
+    return path
@@ -0,0 +1,407 @@
+# service.py — LOCAL HTTP SERVICE (asyncio, standard library only)
+"""
+Serves the calculations, grids and reports over HTTP/1.1 for other tools on
+this machine.
+
+    GET  /health
+    GET  /stats
+    GET  /metrics      Prometheus text (stage timings, see core/metrics.py)
+    GET  /metrics.json same, as JSON
+    POST /calculate    {"name", "dob", "gender"[, "system"]}     -> numbers + grid digits
+    POST /phases       {"dob"} or {"mulank", "bhagyank"}          -> both phases
+    POST /loshu.png    {"dob", "gender"[, "size"]} or {"digits"}  -> image/png
+    POST /loshu.svg    same as /loshu.png                         -> image/svg+xml
+    POST /report.pdf   {"name", "dob", "gender"[, "profile"]}    -> application/pdf
+
+Dates are accepted in any format core.bulk.parse_dob understands. Connections
+are kept alive between requests. Cheap endpoints are answered on the event
+loop; PNG and PDF rendering go to a bounded process pool, and when every
+slot is taken the service answers 503 with Retry-After instead of queueing.
+Identical renders that overlap (same frequency vector and size, or the same
+normalized report inputs) share one pool slot and one result.
+
+Run from the app folder:
+    python service.py --port 8765 --workers 2
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from http import HTTPStatus
+
+from core.numerology_calculations import calculate_all
+from core.systems import DEFAULT_SYSTEM, get_system
+from core.loshu import loshu_digits, frequency_vector, render_loshu_svg
+from core.bulk import parse_dob
+from core.singleflight import AsyncSingleFlight
+from core import metrics
+from core import reports
+
+MAX_BODY = 64 * 1024
+MAX_HEADERS = 64
+KEEPALIVE_TIMEOUT = 15      # seconds an idle connection stays open
+RETRY_AFTER = 1             # seconds suggested to clients turned away with 503
+GRID_SIZES = (64, 2048)     # accepted range for "size"
+GRID_DIR = os.path.join(tempfile.gettempdir(), "numerology_grids")
+
+
+class HttpError(Exception):
+    def __init__(self, status: int, message: str = "", headers=None):
+        super().__init__(message)
+        self.status = status
+        self.message = message or HTTPStatus(status).phrase
+        self.headers = headers or {}
+
+
+# ----------------------------------------------------
+# Request parsing helpers
+# ----------------------------------------------------
+def _field(body: dict, key: str, default=None):
+    value = body.get(key, default)
+    if value is None:
+        raise HttpError(400, f"Missing field '{key}'")
+    return value
+
+
+def _dob(body: dict):
+    try:
+        return parse_dob(str(_field(body, "dob")))
+    except ValueError as e:
+        raise HttpError(400, str(e))
+
+
+def _system(body: dict) -> str:
+    try:
+        return get_system(str(body.get("system", DEFAULT_SYSTEM))).name
+    except ValueError as e:
+        raise HttpError(400, str(e))
+
+
+def _int_field(body: dict, key: str, lo: int, hi: int, default=None) -> int:
+    try:
+        value = int(_field(body, key, default))
+    except (TypeError, ValueError):
+        raise HttpError(400, f"'{key}' must be an integer")
+    if not lo <= value <= hi:
+        raise HttpError(400, f"'{key}' must be between {lo} and {hi}")
+    return value
+
+
+def _grid_digits(body: dict) -> list:
+    """Digits from an explicit list, or derived from dob/gender like the app does."""
+    if "digits" in body:
+        digits = body["digits"]
+        if not isinstance(digits, list) or not all(type(d) is int and 0 <= d <= 9 for d in digits):
+            raise HttpError(400, "'digits' must be a list of integers 0-9")
+        return digits
+    dob = _dob(body)
+    results = calculate_all(str(body.get("name", "")), dob, str(body.get("gender", "Other")))
+    return loshu_digits(dob, results)
+
+
+# ----------------------------------------------------
+# Service
+# ----------------------------------------------------
+class NumerologyService:
+    def __init__(self, host="127.0.0.1", port=8765, workers=None, max_pending=None):
+        self.host = host
+        self.port = port
+        self.workers = workers or max(1, (os.cpu_count() or 2) - 1)
+        self.max_pending = max_pending or self.workers * 4
+        self.stats = {"requests": 0, "rejected": 0, "errors": 0, "connections": 0}
+
+        self._pool = None
+        self._slots = None
+        self._server = None
+        self._flights = AsyncSingleFlight()
+        self._connections = {}   # handler task -> writer, closed on shutdown
+        self._routes = {
+            ("GET", "/health"): self.health,
+            ("GET", "/stats"): self.get_stats,
+            ("GET", "/metrics"): self.get_metrics,
+            ("GET", "/metrics.json"): self.get_metrics_json,
+            ("POST", "/calculate"): self.calculate,
+            ("POST", "/phases"): self.phases,
+            ("POST", "/loshu.png"): self.loshu_png,
+            ("POST", "/loshu.svg"): self.loshu_svg,
+            ("POST", "/report.pdf"): self.report_pdf,
+        }
+
+    # ------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------
+    async def start(self):
+        metrics.enable()
+        # Forked workers would inherit the listening socket and whichever
+        # client connection was open when the pool first grew, so closed
+        # connections never reach EOF. Start them from a clean process instead.
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+        self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=context)
+        self._slots = asyncio.Semaphore(self.max_pending)
+        self._server = await asyncio.start_server(
+            self._handle_connection, self.host, self.port, limit=MAX_BODY
+        )
+        self.port = self._server.sockets[0].getsockname()[1]   # resolves port 0
+        return self
+
+    async def serve_forever(self):
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        if self._server:
+            self._server.close()
+            tasks = list(self._connections)
+            for writer in self._connections.values():
+                writer.close()
+            # let idle keep-alive handlers see EOF and finish
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await self._server.wait_closed()
+        if self._pool:
+            self._pool.shutdown(cancel_futures=True)
+
+    async def _offload(self, fn, *args):
+        """Run fn in the process pool, or refuse with 503 when every slot is busy."""
+        if self._slots.locked():
+            self.stats["rejected"] += 1
+            raise HttpError(503, "Service busy", {"Retry-After": str(RETRY_AFTER)})
+        async with self._slots:
+            loop = asyncio.get_running_loop()
+            try:
+                return await loop.run_in_executor(self._pool, fn, *args)
+            except ValueError as e:
+                raise HttpError(400, str(e))
+
+    # ------------------------------------------------
+    # HTTP/1.1
+    # ------------------------------------------------
+    async def _handle_connection(self, reader, writer):
+        self.stats["connections"] += 1
+        task = asyncio.current_task()
+        self._connections[task] = writer
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(self._read_request(reader), KEEPALIVE_TIMEOUT)
+                except HttpError as e:
+                    await self._send_error(writer, e, keep_alive=False)
+                    break
+                if request is None:
+                    break
+
+                method, path, headers, body, keep_alive = request
+                self.stats["requests"] += 1
+                try:
+                    status, content_type, data = await self._dispatch(method, path, body)
+                except HttpError as e:
+                    await self._send_error(writer, e, keep_alive)
+                except Exception as e:
+                    print("Service error:", method, path, e)
+                    await self._send_error(writer, HttpError(500), keep_alive)
+                else:
+                    await self._send(writer, status, content_type, data, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self._connections.pop(task, None)
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _read_request(self, reader):
+        """Parse one request; None when the client closed the connection between requests."""
+        try:
+            line = await reader.readline()
+        except ValueError:   # request line longer than the stream limit
+            raise HttpError(414)
+        if not line:
+            return None
+
+        try:
+            method, target, version = line.decode("latin-1").rstrip("\r\n").split(" ", 2)
+        except ValueError:
+            raise HttpError(400, "Malformed request line")
+        if not version.startswith("HTTP/1."):
+            raise HttpError(505)
+
+        headers = {}
+        while True:
+            try:
+                raw = await reader.readline()
+            except ValueError:   # header line longer than the stream limit
+                raise HttpError(431)
+            if raw in (b"\r\n", b"\n", b""):
+                break
+            if len(headers) >= MAX_HEADERS:
+                raise HttpError(431)
+            key, _, value = raw.decode("latin-1").partition(":")
+            headers[key.strip().lower()] = value.strip()
+
+        if "chunked" in headers.get("transfer-encoding", "").lower():
+            raise HttpError(411, "Send a Content-Length instead of chunked encoding")
+        try:
+            length = int(headers.get("content-length", 0))
+        except ValueError:
+            raise HttpError(400, "Bad Content-Length")
+        if length < 0:
+            raise HttpError(400, "Bad Content-Length")
+        if length > MAX_BODY:
+            raise HttpError(413)
+        body = await reader.readexactly(length) if length else b""
+
+        connection = headers.get("connection", "").lower()
+        if version == "HTTP/1.0":
+            keep_alive = connection == "keep-alive"
+        else:
+            keep_alive = connection != "close"
+
+        path = target.split("?", 1)[0]
+        return method.upper(), path, headers, body, keep_alive
+
+    async def _dispatch(self, method, path, body):
+        handler = self._routes.get((method, path))
+        if handler is None:
+            if any(p == path for _, p in self._routes):
+                raise HttpError(405)
+            raise HttpError(404)
+
+        if method == "POST":
+            try:
+                payload = json.loads(body or b"{}")
+            except ValueError:
+                raise HttpError(400, "Body must be JSON")
+            if not isinstance(payload, dict):
+                raise HttpError(400, "Body must be a JSON object")
+            return await handler(payload)
+        return await handler()
+
+    async def _send(self, writer, status, content_type, data, keep_alive, extra=None):
+        head = [
+            f"HTTP/1.1 {status} {HTTPStatus(status).phrase}",
+            f"Content-Type: {content_type}",
+            f"Content-Length: {len(data)}",
+            "Connection: " + ("keep-alive" if keep_alive else "close"),
+        ]
+        if keep_alive:
+            head.append(f"Keep-Alive: timeout={KEEPALIVE_TIMEOUT}")
+        head.extend(f"{k}: {v}" for k, v in (extra or {}).items())
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + data)
+        await writer.drain()
+
+    async def _send_error(self, writer, error, keep_alive):
+        if error.status >= 500 and error.status != 503:
+            self.stats["errors"] += 1
+        data = json.dumps({"error": error.message}).encode("utf-8")
+        await self._send(writer, error.status, "application/json", data, keep_alive, error.headers)
+
+    # ------------------------------------------------
+    # Endpoints — each returns (status, content type, bytes)
+    # ------------------------------------------------
+    @staticmethod
+    def _json(obj, status=200):
+        return status, "application/json", json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+    async def health(self):
+        return self._json({"status": "ok"})
+
+    async def get_stats(self):
+        return self._json(dict(self.stats, workers=self.workers, max_pending=self.max_pending,
+                               coalescing=self._flights.stats()))
+
+    async def get_metrics(self):
+        # stages run in the render processes are timed there, not here
+        return 200, "text/plain; version=0.0.4", metrics.REGISTRY.to_prometheus().encode("utf-8")
+
+    async def get_metrics_json(self):
+        return self._json(metrics.REGISTRY.to_json())
+
+    async def calculate(self, body):
+        name = str(_field(body, "name"))
+        dob = _dob(body)
+        system = _system(body)
+        results = calculate_all(name, dob, str(body.get("gender", "Other")), system)
+        digits = loshu_digits(dob, results)
+        return self._json({
+            "system": system,
+            "results": results,
+            "digits": digits,
+            "frequency": frequency_vector(digits),
+        })
+
+    async def phases(self, body):
+        from core.driver_conductor import get_phase_analysis
+
+        if "mulank" in body or "bhagyank" in body:
+            mulank = _int_field(body, "mulank", 1, 9)
+            bhagyank = _int_field(body, "bhagyank", 1, 9)
+        else:
+            results = calculate_all("", _dob(body), "Other")
+            mulank, bhagyank = results["Mulank"], results["Bhagyank"]
+        return self._json({"mulank": mulank, "bhagyank": bhagyank,
+                           "phases": get_phase_analysis(mulank, bhagyank)})
+
+    async def loshu_png(self, body):
+        size = _int_field(body, "size", *GRID_SIZES, default=520)
+        digits = _grid_digits(body)
+        key = ("png", frequency_vector(digits), size)
+        data = await self._flights.do(key, self._offload, reports.render_grid_png, digits, size)
+        return 200, "image/png", data
+
+    async def loshu_svg(self, body):
+        size = _int_field(body, "size", *GRID_SIZES, default=520)
+        return 200, "image/svg+xml", render_loshu_svg(_grid_digits(body), size).encode("utf-8")
+
+    async def report_pdf(self, body):
+        from core.pdf_report import PDF_PROFILES, DEFAULT_PROFILE
+
+        name = str(_field(body, "name"))
+        dob = _dob(body)
+        gender = str(body.get("gender", "Other"))
+        profile = body.get("profile", DEFAULT_PROFILE)
+        if profile not in PDF_PROFILES:
+            raise HttpError(400, f"Unknown profile {profile!r}; choose from {', '.join(PDF_PROFILES)}")
+        key = ("pdf", name, dob, gender, profile)   # as printed: no case or space folding
+        data = await self._flights.do(key, self._offload, reports.render_report_pdf,
+                                      name, dob, gender, profile, GRID_DIR)
+        return 200, "application/pdf", data
+
+
+# =====================================================================
+# CLI
+# =====================================================================
+async def _serve(args):
+    service = NumerologyService(args.host, args.port, args.workers, args.max_pending)
+    await service.start()
+    print(f"Serving on http://{service.host}:{service.port} "
+          f"({service.workers} workers, {service.max_pending} pending max)")
+    try:
+        await service.serve_forever()
+    finally:
+        await service.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local numerology HTTP service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=None, help="render processes")
+    parser.add_argument("--max-pending", type=int, default=None,
+                        help="render requests in flight before answering 503")
+    args = parser.parse_args()
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
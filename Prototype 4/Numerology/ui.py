@@ -1,37 +1,82 @@
 # ui.py — SOFT PURPLE UI + FULL RIGHT BG IMAGE + TRANSPARENT GRID
 
 import os
+import time
 # from core.util import resource_path
 
+from collections import OrderedDict
 from datetime import date
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QLabel, QVBoxLayout, QHBoxLayout,
     QLineEdit, QPushButton, QDateEdit, QComboBox, QFrame, QMessageBox,
-    QSizePolicy, QFileDialog, QScrollArea
+    QSizePolicy, QFileDialog, QScrollArea, QCheckBox, QListWidget, QListWidgetItem
 )
 from PySide6.QtGui import QFont, QPixmap, QPainter
-from PySide6.QtCore import Qt, QDate, QTimer
-from PIL.ImageQt import ImageQt
-from PIL import Image
+from PySide6.QtCore import Qt, QDate, QTimer, QThreadPool, QSignalBlocker
 
-from core.numerology_calculations import calculate_all
-from core.driver_conductor import get_phase_analysis
-from core.pdf_report import create_pdf_report
-from core.loshu import render_loshu_grid
+from workers import Worker, analysis_job, grid_job, export_job, load_grid_job
+from core.incremental import IncrementalAnalysis, NAME, NUMBERS, PHASES, GRID
+from core.history import HistoryStore
+from core import metrics
 
 
-def make_chip(text):
-    lbl = QLabel(text)
-    lbl.setFont(QFont("Segoe UI", 9, QFont.Weight.Medium))
-    lbl.setStyleSheet(
-        "QLabel { background-color: #ccc4ff; color: #3a2a60; "
-        "border-radius: 12px; padding: 6px 12px; margin-right:4px; }"
-    )
-    return lbl
+# Applied once per chip row; labels pick it up by object name
+CHIP_STYLE = (
+    "QLabel#chip { background-color: #ccc4ff; color: #3a2a60; "
+    "border-radius: 12px; padding: 6px 12px; margin-right:4px; }"
+    "QLabel#chipEmpty { color: white; }"
+)
+
+
+class ChipPool:
+    """
+    Keyword chips for one row. Labels are created on first need and then
+    reused: repopulating only changes text and visibility, never rebuilds
+    widgets or reparses stylesheets.
+    """
+
+    def __init__(self, container, layout):
+        container.setStyleSheet(CHIP_STYLE)
+        self._layout = layout
+        self._font = QFont("Segoe UI", 9, QFont.Weight.Medium)
+        self._chips = []
+
+        self._empty = QLabel("—")
+        self._empty.setObjectName("chipEmpty")
+        layout.addWidget(self._empty)
+
+    def _grow(self, count):
+        while len(self._chips) < count:
+            lbl = QLabel()
+            lbl.setObjectName("chip")
+            lbl.setFont(self._font)
+            lbl.hide()
+            self._layout.insertWidget(len(self._chips), lbl)
+            self._chips.append(lbl)
+
+    def set_keywords(self, keywords):
+        keywords = keywords or []
+        self._grow(len(keywords))
+
+        for i, lbl in enumerate(self._chips):
+            if i < len(keywords):
+                if lbl.text() != keywords[i]:
+                    lbl.setText(keywords[i])
+                if lbl.isHidden():
+                    lbl.show()
+            elif not lbl.isHidden():
+                lbl.hide()
+
+        self._empty.setVisible(not keywords)
 
 
 class MainWindow(QMainWindow):
     MAX_GRID_SIZE = 600  # cap grid size—no fullscreen zoom
+    BG_PATH = "assets/bg.png"
+    RESIZE_SETTLE_MS = 120   # smooth rescale once the drag pauses this long
+    BG_CACHE_SIZE = 4        # scaled backgrounds kept, keyed by label size
+    LIVE_DEBOUNCE_MS = 250   # live mode waits for typing to pause this long
+    GRID_MEMORY_SIZE = 16    # decoded grids kept for instant history recall
 
     def __init__(self):
         super().__init__()
@@ -39,9 +84,46 @@ class MainWindow(QMainWindow):
         self.setGeometry(100, 40, 1360, 820)
 
         self._last_report = None
-        self._loshu_original = None
+        self._loshu_original = None   # QImage of the rendered grid
+        self._loshu_buffer = None     # bytes the QImage points into; must outlive it
         self._loshu_display_size = None
 
+        # Background work: compute/render/export never run on the GUI thread
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(2)
+        self._job_counter = 0
+        self._compute_job = None      # (job id, Worker) of the latest compute
+        self._compute_started = 0.0
+        self._grid_job = None         # (job id, Worker) of the latest live grid render
+        self._export_job = None
+        self._loshu_path = None
+
+        # Live mode
+        self._analysis = IncrementalAnalysis()
+        self._live_timer = QTimer(self)
+        self._live_timer.setSingleShot(True)
+        self._live_timer.setInterval(self.LIVE_DEBOUNCE_MS)
+        self._live_timer.timeout.connect(self._live_update)
+
+        # Session history
+        try:
+            self._history = HistoryStore()
+        except Exception as e:
+            print("History disabled:", e)
+            self._history = None
+        self._grid_memory = OrderedDict()   # grid file name -> (QImage, buffer)
+        self._recall_job = None
+        self._recalled_session = None   # history entry on screen, until anything else replaces it
+        self._bulk_window = None
+
+        # Background image: decoded once, scaled results cached by size
+        self._bg_source = None
+        self._bg_scaled = OrderedDict()
+        self._resize_timer = QTimer(self)
+        self._resize_timer.setSingleShot(True)
+        self._resize_timer.setInterval(self.RESIZE_SETTLE_MS)
+        self._resize_timer.timeout.connect(self._finish_resize)
+
         self.setStyleSheet(self._main_styles())  # Apply theme
 
         # Root layout
@@ -127,6 +209,15 @@ class MainWindow(QMainWindow):
         self.gender_box.addItems(["Male", "Female", "Other"])
         layout.addWidget(self.gender_box)
 
+        self.live_box = QCheckBox("Live results (update as you type)")
+        self.live_box.setStyleSheet("color:#3A2A60;")
+        self.live_box.toggled.connect(self._on_live_toggled)
+        layout.addWidget(self.live_box)
+
+        self.name_input.textChanged.connect(self._on_input_changed)
+        self.dob_input.dateChanged.connect(self._on_input_changed)
+        self.gender_box.currentTextChanged.connect(self._on_input_changed)
+
         # Buttons
         btn_row = QHBoxLayout()
         self.compute_btn = QPushButton("Compute")
@@ -141,7 +232,11 @@ class MainWindow(QMainWindow):
         self.clear_btn.setObjectName("clearBtn")
         self.clear_btn.clicked.connect(self.clear_all)
 
-        for b in (self.compute_btn, self.export_btn, self.clear_btn):
+        self.bulk_btn = QPushButton("Bulk View")
+        self.bulk_btn.setObjectName("exportBtn")
+        self.bulk_btn.clicked.connect(self.open_bulk_view)
+
+        for b in (self.compute_btn, self.export_btn, self.clear_btn, self.bulk_btn):
             b.setMinimumWidth(120)
             btn_row.addWidget(b)
 
@@ -149,6 +244,7 @@ class MainWindow(QMainWindow):
 
         layout.addWidget(self._result_card())
         layout.addWidget(self._phase_card())
+        layout.addWidget(self._history_card())
         layout.addStretch(1)
 
         scroll = QScrollArea()
@@ -223,6 +319,7 @@ class MainWindow(QMainWindow):
 
         kw1 = QWidget()
         kw1.setLayout(self.ph1_keywords_layout)
+        self.ph1_chips = ChipPool(kw1, self.ph1_keywords_layout)
         layout.addWidget(kw1)
 
         sep = QFrame()
@@ -243,10 +340,102 @@ class MainWindow(QMainWindow):
 
         kw2 = QWidget()
         kw2.setLayout(self.ph2_keywords_layout)
+        self.ph2_chips = ChipPool(kw2, self.ph2_keywords_layout)
         layout.addWidget(kw2)
 
         return card
 
+    # =====================================================================
+    # HISTORY CARD
+    # =====================================================================
+    def _history_card(self):
+        card = QFrame()
+        card.setObjectName("card")
+        layout = QVBoxLayout(card)
+
+        hdr = QLabel("🕘 Recent Clients")
+        hdr.setFont(QFont("Segoe UI", 14, QFont.Weight.Bold))
+        hdr.setStyleSheet("color:#C3B3FF;")
+        layout.addWidget(hdr)
+
+        self.history_search = QLineEdit()
+        self.history_search.setPlaceholderText("Search by name…")
+        self.history_search.textChanged.connect(self._refresh_history)
+        layout.addWidget(self.history_search)
+
+        self.history_list = QListWidget()
+        self.history_list.setMinimumHeight(140)
+        self.history_list.setStyleSheet("QListWidget { background:#FFFFFF; color:#3A2A60; border-radius:8px; }")
+        # a double-click sends both; recalling the entry already on screen is a no-op
+        self.history_list.itemClicked.connect(self._recall_session)
+        self.history_list.itemActivated.connect(self._recall_session)   # Enter key
+        layout.addWidget(self.history_list)
+
+        QTimer.singleShot(0, self._refresh_history)
+        return card
+
+    def _refresh_history(self, *_):
+        if not self._history:
+            return
+        self.history_list.clear()
+        for session_id, name, dob in self._history.search(self.history_search.text()):
+            item = QListWidgetItem(f"{name}  ·  {dob.strftime('%d-%m-%Y')}")
+            item.setData(Qt.UserRole, session_id)
+            self.history_list.addItem(item)
+
+    def _remember_grid(self, path, qimage, buffer):
+        if not path:
+            return
+        key = os.path.basename(path)
+        self._grid_memory[key] = (qimage, buffer)
+        self._grid_memory.move_to_end(key)
+        while len(self._grid_memory) > self.GRID_MEMORY_SIZE:
+            self._grid_memory.popitem(last=False)
+
+    def _recall_session(self, item):
+        """Show a stored client straight from history: no recalculation, no re-render."""
+        session_id = item.data(Qt.UserRole)
+        if session_id == self._recalled_session:
+            return
+        payload = self._history.load(session_id)
+        if not payload:
+            return
+        self._recalled_session = session_id
+
+        for job in (self._compute_job, self._grid_job, self._recall_job):
+            if job:
+                job[1].cancel()
+        self._compute_job = self._grid_job = self._recall_job = None
+
+        # restore inputs without triggering live mode
+        dob = payload["dob"]
+        with QSignalBlocker(self.name_input), QSignalBlocker(self.dob_input), QSignalBlocker(self.gender_box):
+            self.name_input.setText(payload["name"])
+            self.dob_input.setDate(QDate(dob.year, dob.month, dob.day))
+            self.gender_box.setCurrentText(payload["gender"])
+        self._analysis = IncrementalAnalysis()
+        self._analysis.update(payload["name"], dob, payload["gender"])
+
+        self._show_numbers(payload["results"])
+        self._show_phases(payload["phases"])
+        self._last_report = {k: v for k, v in payload.items() if k != "session_id"}
+        self._sync_export_button()
+
+        path = payload["loshu_image"]
+        cached = self._grid_memory.get(os.path.basename(path)) if path else None
+        if cached:
+            self._show_grid({"qimage": cached[0], "buffer": cached[1], "loshu_image": path})
+        elif path and os.path.exists(path):
+            worker = self._new_worker(load_grid_job, path)
+            worker.signals.result.connect(self._on_recall_grid_ready)
+            self._recall_job = (worker.job_id, worker)
+            self._pool.start(worker)
+
+    def _on_recall_grid_ready(self, job_id, out):
+        if not self._recall_job or self._recall_job[0] != job_id:
+            return  # superseded
+        self._show_grid(out)
+
     # =====================================================================
     # RIGHT PANEL (FULL BACKGROUND IMAGE)
     # =====================================================================
@@ -275,22 +464,40 @@ class MainWindow(QMainWindow):
     # =====================================================================
     # SHOW FULL-SIZE BACKGROUND IMAGE
     # =====================================================================
-    def show_default_loshu_background(self):
-        bg_path = "assets/bg.png"
-
-        if os.path.exists(bg_path):
-            bg = QPixmap(bg_path)
-        else:
-            bg = QPixmap(800, 800)
-            bg.fill(Qt.darkMagenta)
+    def _background_source(self):
+        if self._bg_source is None:
+            if os.path.exists(self.BG_PATH):
+                self._bg_source = QPixmap(self.BG_PATH)
+            else:
+                self._bg_source = QPixmap(800, 800)
+                self._bg_source.fill(Qt.darkMagenta)
+        return self._bg_source
+
+    def _scaled_background(self, smooth=True):
+        """Background scaled to the label. Smooth results are cached; fast ones are for live drags only."""
+        size = (self.bg_label.width(), self.bg_label.height())
+
+        if not smooth:
+            return self._background_source().scaled(
+                *size, Qt.KeepAspectRatioByExpanding, Qt.FastTransformation
+            )
+
+        cached = self._bg_scaled.get(size)
+        if cached is not None:
+            self._bg_scaled.move_to_end(size)
+            return cached
 
         # Fill entire background area → NO size limit
-        self.bg_label.setPixmap(bg.scaled(
-            self.bg_label.width(),
-            self.bg_label.height(),
-            Qt.KeepAspectRatioByExpanding,
-            Qt.SmoothTransformation
-        ))
+        scaled = self._background_source().scaled(
+            *size, Qt.KeepAspectRatioByExpanding, Qt.SmoothTransformation
+        )
+        self._bg_scaled[size] = scaled
+        while len(self._bg_scaled) > self.BG_CACHE_SIZE:
+            self._bg_scaled.popitem(last=False)
+        return scaled
+
+    def show_default_loshu_background(self, smooth=True):
+        self.bg_label.setPixmap(self._scaled_background(smooth))
 
     # =====================================================================
     # COMPUTE NUMEROLOGY + DRAW TRANSPARENT GRID ON TOP OF BACKGROUND
@@ -305,75 +512,181 @@ class MainWindow(QMainWindow):
         dob = date(dob_q.year(), dob_q.month(), dob_q.day())
         gender = self.gender_box.currentText()
 
-        results = calculate_all(name, dob, gender)
+        # A newer compute supersedes any still running
+        for job in (self._compute_job, self._grid_job, self._recall_job):
+            if job:
+                job[1].cancel()
+        self._grid_job = self._recall_job = None
+        self._recalled_session = None
+
+        worker = self._new_worker(analysis_job, name, dob, gender)
+        worker.signals.result.connect(self._on_analysis_ready)
+        self._compute_job = (worker.job_id, worker)
+        self._compute_started = time.perf_counter()
+        self._pool.start(worker)
+
+    def _new_worker(self, fn, *args):
+        self._job_counter += 1
+        worker = Worker(self._job_counter, fn, *args)
+        worker.signals.progress.connect(self._on_job_progress)
+        worker.signals.error.connect(self._on_job_error)
+        worker.signals.finished.connect(self._on_job_finished)
+        return worker
+
+    def _is_current(self, job_id):
+        jobs = (self._compute_job, self._grid_job, self._recall_job, self._export_job)
+        return any(j and j[0] == job_id for j in jobs)
+
+    def _on_job_progress(self, job_id, percent, message):
+        if self._is_current(job_id):
+            self.statusBar().showMessage(f"{message} {percent}%")
+
+    def _on_job_error(self, job_id, message):
+        if self._export_job and self._export_job[0] == job_id:
+            QMessageBox.critical(self, "Export Error", f"Failed to create PDF:\n{message}")
+        elif self._is_current(job_id):
+            QMessageBox.critical(self, "Compute Error", f"Analysis failed:\n{message}")
+
+    def _on_job_finished(self, job_id):
+        if self._compute_job and self._compute_job[0] == job_id:
+            self._compute_job = None
+        elif self._grid_job and self._grid_job[0] == job_id:
+            self._grid_job = None
+        elif self._recall_job and self._recall_job[0] == job_id:
+            self._recall_job = None
+        elif self._export_job and self._export_job[0] == job_id:
+            self._export_job = None
+        else:
+            return
+        self._sync_export_button()
+        self.statusBar().clearMessage()
+
+    def _on_analysis_ready(self, job_id, out):
+        if not self._compute_job or self._compute_job[0] != job_id:
+            return  # superseded
+
+        with metrics.span("ui_display"):
+            self._show_numbers(out["results"])
+            self._show_phases(out["phases"])
+            self._show_grid(out)
+        # click to results on screen, including time queued on the pool
+        metrics.observe("ui_compute", time.perf_counter() - self._compute_started)
+
+        # keep live mode in step with what is on screen
+        self._analysis.update(out["name"], out["dob"], out["gender"])
 
-        # SUMMARY UI UPDATE
+        # ---- SAVE CORRECT PAYLOAD FOR PDF ----
+        self._last_report = {
+            "name": out["name"],
+            "dob": out["dob"],
+            "gender": out["gender"],
+            "results": out["results"],
+            "loshu_image": out["loshu_image"],
+            "phases": out["phases"]
+        }
+        self._sync_export_button()
+
+        if self._history:
+            try:
+                self._history.save(self._last_report)
+                self._refresh_history()
+            except Exception as e:
+                print("History save failed:", e)
+
+    def _show_numbers(self, results):
         self.mulank_label.setText(f"Mulank (Birth Number): {results['Mulank']}")
         self.bhagyank_label.setText(f"Bhagyank (Destiny Number): {results['Bhagyank']}")
         self.name_label.setText(f"Name Number (Chaldean): {results['Name Number']} (Total: {results['Name Total']})")
         self.angel_label.setText(f"Angel Number: {results['Angel Number']}")
 
-        # PHASE DATA
-        phases = get_phase_analysis(results["Mulank"], results["Bhagyank"])
+    def _show_phases(self, phases):
         p1 = phases["0-40"]
         p2 = phases["40-80"]
 
         self.ph1_stars.setText(f"Stars: {p1['stars_raw']}")
         self.ph1_rating.setText(f"Rating: {p1['rating_clean']}")
         self.ph1_meaning.setText(f"Meaning: {p1['meaning_raw']}")
-        self._populate_chips(self.ph1_keywords_layout, p1["meaning_clean"])
+        self.ph1_chips.set_keywords(p1["meaning_clean"])
 
         self.ph2_stars.setText(f"Stars: {p2['stars_raw']}")
         self.ph2_rating.setText(f"Rating: {p2['rating_clean']}")
         self.ph2_meaning.setText(f"Meaning: {p2['meaning_raw']}")
-        self._populate_chips(self.ph2_keywords_layout, p2["meaning_clean"])
-
-        # DIGITS FOR LOSHU GRID
-        digits = []
-        digits.extend(int(d) for d in str(dob.day))
-        digits.extend(int(d) for d in str(dob.month))
-        digits.extend(int(d) for d in str(dob.year))
-
-        mulank = results["Mulank"]
-        bhagyank = results["Bhagyank"]
-        angel = results["Angel Number"]
+        self.ph2_chips.set_keywords(p2["meaning_clean"])
+
+    def _show_grid(self, out):
+        # QImage wraps the worker's byte buffer — no PIL/Qt copies on the way
+        self._loshu_original = out["qimage"]
+        self._loshu_buffer = out["buffer"]
+        self._loshu_path = out["loshu_image"]
+        self._remember_grid(self._loshu_path, self._loshu_original, self._loshu_buffer)
+        self.show_default_loshu_background()
+        self.overlay_grid_on_background()
 
-        if mulank != dob.day:
-            digits.extend(int(d) for d in str(mulank))
+    # =====================================================================
+    # LIVE MODE — debounced, incremental
+    # =====================================================================
+    def _on_input_changed(self, *_):
+        self._recalled_session = None   # edited: clicking the entry again restores it
+        if self.live_box.isChecked():
+            self._live_timer.start()
+
+    def _on_live_toggled(self, checked):
+        if checked:
+            self._live_update()
+        else:
+            self._live_timer.stop()
 
-        digits.extend(int(d) for d in str(bhagyank))
-        digits.extend(int(d) for d in str(angel))
+    def _live_update(self):
+        name = self.name_input.text().strip()
+        if not name:
+            return
 
-        # RENDER LOSHU GRID
-        pil_img = render_loshu_grid(digits, size=800)
-        qim = ImageQt(pil_img)
-        grid_pix = QPixmap.fromImage(qim)
-        self._loshu_original = grid_pix
-        self.overlay_grid_on_background()
+        dob_q = self.dob_input.date()
+        dob = date(dob_q.year(), dob_q.month(), dob_q.day())
+        gender = self.gender_box.currentText()
 
-        # ---- SAVE LOSHU GRID TEMP FILE ----
-        os.makedirs("core/temp", exist_ok=True)
-        loshu_path = "core/temp/loshu_grid.png"
-        pil_img.save(loshu_path)
+        changed = self._analysis.update(name, dob, gender)
+        st = self._analysis
+
+        if changed & {NAME, NUMBERS}:
+            self._show_numbers(st.results)
+        if PHASES in changed:
+            self._show_phases(st.phases)
+
+        if GRID in changed or self._loshu_original is None:
+            for job in (self._compute_job, self._grid_job, self._recall_job):
+                if job:
+                    job[1].cancel()
+            self._compute_job = self._recall_job = None
+            worker = self._new_worker(grid_job, list(st.digits))
+            worker.signals.result.connect(self._on_live_grid_ready)
+            self._grid_job = (worker.job_id, worker)
+            self._pool.start(worker)
+            self._loshu_path = None
 
-        # ---- SAVE CORRECT PAYLOAD FOR PDF ----
         self._last_report = {
             "name": name,
             "dob": dob,
             "gender": gender,
-            "results": results,
-            "loshu_image": loshu_path,
-            "phases": {
-                "0-40": p1,
-                "40-80": p2
-            }
+            "results": st.results_in_order(),
+            "loshu_image": self._loshu_path,
+            "phases": st.phases
         }
+        self._sync_export_button()
+
+    def _on_live_grid_ready(self, job_id, out):
+        if not self._grid_job or self._grid_job[0] != job_id:
+            return  # superseded
+        self._show_grid(out)
+        if self._last_report:
+            self._last_report["loshu_image"] = out["loshu_image"]
+            self._sync_export_button()
 
     # =====================================================================
     # OVERLAY THE TRANSPARENT GRID ON THE BG IMAGE
     # =====================================================================
     def overlay_grid_on_background(self):
-        if not self._loshu_original:
+        if self._loshu_original is None:
             return
 
         base = self.bg_label.pixmap()
@@ -386,30 +699,11 @@ class MainWindow(QMainWindow):
 
         painter = QPainter(final)
         painter.drawPixmap(0, 0, base)                    # draw background
-        painter.drawPixmap(0, 0, self._loshu_original)    # draw transparent grid
+        painter.drawImage(0, 0, self._loshu_original)     # draw transparent grid
         painter.end()
 
         self.bg_label.setPixmap(final)
 
-    # =====================================================================
-    # POPULATE KEYWORDS
-    # =====================================================================
-    def _populate_chips(self, layout, keywords):
-        while layout.count():
-            item = layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
-
-        if not keywords:
-            lbl = QLabel("—")
-            lbl.setStyleSheet("color:white;")
-            layout.addWidget(lbl)
-            return
-
-        for kw in keywords:
-            layout.addWidget(make_chip(kw))
-
-    
     # -----------------------
     # Export PDF
     # -----------------------
@@ -419,11 +713,32 @@ class MainWindow(QMainWindow):
             return
         path,_ = QFileDialog.getSaveFileName(self,"Save PDF Report","Numerology_Report.pdf","PDF Files (*.pdf)")
         if not path: return
-        try:
-            create_pdf_report(path,self._last_report)
-            QMessageBox.information(self,"Exported",f"PDF saved to:\n{path}")
-        except Exception as e:
-            QMessageBox.critical(self,"Export Error",f"Failed to create PDF:\n{e}")
+
+        # a copy: live mode keeps updating _last_report while the worker reads it
+        worker = self._new_worker(export_job, path, dict(self._last_report))
+        worker.signals.result.connect(
+            lambda job_id, stats: QMessageBox.information(self,"Exported",f"PDF saved to:\n{path}")
+        )
+        self._export_job = (worker.job_id, worker)
+        self._sync_export_button()
+        self._pool.start(worker)
+
+    def _sync_export_button(self):
+        # off while an export runs, and while live mode's grid is still
+        # rendering (exporting then would produce a report with no grid)
+        grid_pending = bool(self._last_report) and self._last_report["loshu_image"] is None
+        self.export_btn.setEnabled(self._export_job is None and not grid_pending)
+
+    # =====================================================================
+    # BULK VIEW
+    # =====================================================================
+    def open_bulk_view(self):
+        from bulk_view import BulkWindow
+
+        if self._bulk_window is None:
+            self._bulk_window = BulkWindow(self)
+        self._bulk_window.show()
+        self._bulk_window.raise_()
 
     # =====================================================================
     # CLEAR
@@ -432,20 +747,43 @@ class MainWindow(QMainWindow):
         self.name_input.clear()
         self.grid_label_text = "Your Lo Shu Grid will appear here."
 
-        self._populate_chips(self.ph1_keywords_layout, [])
-        self._populate_chips(self.ph2_keywords_layout, [])
+        self.ph1_chips.set_keywords([])
+        self.ph2_chips.set_keywords([])
         self._loshu_original = None
+        self._loshu_buffer = None
+        for job in (self._compute_job, self._grid_job, self._recall_job):
+            if job:
+                job[1].cancel()
+        self._compute_job = self._grid_job = self._recall_job = None
+        self._recalled_session = None
+        self._analysis = IncrementalAnalysis()
+        self.statusBar().clearMessage()
 
         QTimer.singleShot(0, self.show_default_loshu_background)
 
+    def closeEvent(self, event):
+        for job in (self._compute_job, self._grid_job, self._recall_job):
+            if job:
+                job[1].cancel()
+        self._pool.waitForDone()
+        super().closeEvent(event)
+
     # =====================================================================
     # RESIZE HANDLER (updates background size)
     # =====================================================================
     def resizeEvent(self, event):
+        super().resizeEvent(event)
+        # while dragging, a bare background gets a cheap fast rescale; a grid
+        # composite is left as it is for the label to stretch, so the grid stays
+        # on screen. Both are rebuilt smoothly once, when resizing settles
+        if self._loshu_original is None:
+            self.show_default_loshu_background(smooth=False)
+        self._resize_timer.start()
+
+    def _finish_resize(self):
         self.show_default_loshu_background()
-        if self._loshu_original:
+        if self._loshu_original is not None:
             self.overlay_grid_on_background()
-        super().resizeEvent(event)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,173 @@
+# workers.py — BACKGROUND JOBS FOR THE GUI (QThreadPool)
+
+import os
+import sys
+
+from PySide6.QtCore import QObject, QRunnable, Signal, Slot
+from PySide6.QtGui import QImage
+
+from core.numerology_calculations import calculate_all
+from core.loshu import render_loshu_grid, loshu_digits, frequency_vector
+from core.singleflight import SingleFlight
+from core.metrics import span
+
+# core.driver_conductor and core.pdf_report (reportlab) are imported inside
+# the jobs that need them, keeping them off the startup path.
+
+TEMP_DIR = "core/temp"
+
+# Compute and live-preview jobs can ask for the same grid at the same time;
+# renders are keyed by (frequency vector, size) and run once.
+grid_flights = SingleFlight()
+
+
+class WorkerCancelled(Exception):
+    """Raised inside a job when a newer job has superseded it."""
+
+
+class WorkerSignals(QObject):
+    result = Signal(int, object)        # job id, value returned by the job
+    progress = Signal(int, int, str)    # job id, percent, message
+    error = Signal(int, str)            # job id, message
+    finished = Signal(int)              # job id
+
+
+class JobContext:
+    """Handed to every job function: progress reporting and cancellation checks."""
+
+    def __init__(self, job_id, signals):
+        self.job_id = job_id
+        self._signals = signals
+        self.cancelled = False
+
+    def progress(self, percent, message=""):
+        self.check()
+        self._signals.progress.emit(self.job_id, percent, message)
+
+    def check(self):
+        if self.cancelled:
+            raise WorkerCancelled()
+
+
+class Worker(QRunnable):
+    """Runs fn(ctx, *args, **kwargs) on a pool thread and reports back through signals."""
+
+    def __init__(self, job_id, fn, *args, **kwargs):
+        super().__init__()
+        self.job_id = job_id
+        self.signals = WorkerSignals()
+        self.ctx = JobContext(job_id, self.signals)
+        self._fn = fn
+        self._args = args
+        self._kwargs = kwargs
+
+    def cancel(self):
+        self.ctx.cancelled = True
+
+    @Slot()
+    def run(self):
+        try:
+            value = self._fn(self.ctx, *self._args, **self._kwargs)
+            self.ctx.check()
+            self.signals.result.emit(self.job_id, value)
+        except WorkerCancelled:
+            pass
+        except Exception as e:
+            self.signals.error.emit(self.job_id, str(e))
+        finally:
+            self.signals.finished.emit(self.job_id)
+
+
+# =====================================================================
+# JOBS
+# =====================================================================
+def analysis_job(ctx, name, dob, gender, grid_size=800):
+    """Everything behind the Compute button except widget updates."""
+    from core.driver_conductor import get_phase_analysis
+
+    ctx.progress(5, "Calculating numbers…")
+    results = calculate_all(name, dob, gender)
+    with span("phases"):
+        phases = get_phase_analysis(results["Mulank"], results["Bhagyank"])
+    digits = loshu_digits(dob, results)
+
+    out = grid_job(ctx, digits, grid_size)
+    out.update({
+        "name": name,
+        "dob": dob,
+        "gender": gender,
+        "results": results,
+        "phases": phases,
+        "digits": digits,
+    })
+    return out
+
+
+def grid_job(ctx, digits, grid_size=800):
+    """Render, save and wrap the Lo Shu grid. Returns {"loshu_image", "qimage", "buffer"}."""
+    ctx.progress(20, "Rendering Lo Shu grid…")
+    freq = frequency_vector(digits)
+    pil_img = grid_flights.do((freq, grid_size), render_loshu_grid, digits, size=grid_size)
+
+    ctx.progress(75, "Saving grid image…")
+    os.makedirs(TEMP_DIR, exist_ok=True)
+    # one file per frequency vector, so superseded jobs never write the same path
+    key = "".join(str(n) for n in freq)
+    loshu_path = os.path.join(TEMP_DIR, f"loshu_{key}_{grid_size}.png")
+    if not os.path.exists(loshu_path):
+        tmp = f"{loshu_path}.{ctx.job_id}.tmp"
+        with span("png_encode"):
+            pil_img.save(tmp, format="PNG")
+        os.replace(tmp, loshu_path)
+
+    ctx.progress(90, "Preparing display…")
+    with span("qimage_wrap"):
+        qimage, buffer = pil_to_qimage(pil_img)
+
+    return {"loshu_image": loshu_path, "qimage": qimage, "buffer": buffer}
+
+
+def thumbnail_job(ctx, freq, size):
+    """Small Lo Shu grid for a frequency vector (bulk table). Returns a QImage that owns its pixels."""
+    from PIL import Image
+
+    digits = [n for n, count in zip(range(1, 10), freq) for _ in range(count)]
+    # the grid's fonts have minimum sizes, so render at a legible size and shrink
+    thumb = render_loshu_grid(digits, size=240).resize((size, size), Image.LANCZOS)
+    qimage, _buffer = pil_to_qimage(thumb)
+    return qimage.copy()
+
+
+def load_grid_job(ctx, path):
+    """Decode a stored grid PNG for display (history recall). Returns {"loshu_image", "qimage", "buffer"}."""
+    qimage = QImage(path)
+    if qimage.isNull():
+        raise ValueError(f"Cannot read grid image: {path}")
+    return {"loshu_image": path, "qimage": qimage, "buffer": None}
+
+
+def pil_to_qimage(pil_img):
+    """
+    Hand an RGBA PIL image to Qt through a single byte buffer.
+
+    The QImage points at the returned buffer instead of copying it, so the
+    caller must keep the buffer alive as long as the QImage is in use. On
+    little-endian machines the bytes are packed premultiplied BGRA, which is
+    ARGB32_Premultiplied in memory — the raster engine draws that without
+    converting.
+    """
+    w, h = pil_img.size
+    if sys.byteorder == "little":
+        buffer = pil_img.tobytes("raw", "BGRa")
+        fmt = QImage.Format_ARGB32_Premultiplied
+    else:
+        buffer = pil_img.tobytes("raw", "RGBA")
+        fmt = QImage.Format_RGBA8888
+    return QImage(buffer, w, h, 4 * w, fmt), buffer
+
+
+def export_job(ctx, path, payload):
+    from core.pdf_report import create_pdf_report
+
+    ctx.progress(10, "Writing PDF…")
+    return create_pdf_report(path, payload)